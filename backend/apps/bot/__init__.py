@@ -7,12 +7,14 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
 
+import hashlib
 import logging
+from typing import Optional
+
 from telegram.ext import (
     Application, CommandHandler, MessageHandler, CallbackQueryHandler,
     ConversationHandler, filters
 )
-from telegram.error import TelegramError, RetryAfter
 from django.conf import settings
 
 from .states import (
@@ -80,6 +82,9 @@ from .handlers.registration import (
     voter_slot_end,
 )
 from .handlers.profile import show_edit_options, edit_field, edit_input, more_edits
+from .jobs import setup_background_jobs
+from .utils.persistence import build_persistence
+from .utils.update_processor import ChatOrderedUpdateProcessor
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -114,8 +119,11 @@ async def error_handler(update, context):
 def setup_bot_handlers(app: Application) -> None:
     """Setup all bot handlers with conversation"""
     
+    # persistent: состояние диалога переживает перезапуск бота, если задан BOT_PERSISTENCE
     conv_handler = ConversationHandler(
         entry_points=[CommandHandler('start', start)],
+        name='main',
+        persistent=app.persistence is not None,
         states={
             START: [
                 CallbackQueryHandler(button_start, pattern=PATTERN_MAIN_MENU),
@@ -208,37 +216,35 @@ def setup_bot_handlers(app: Application) -> None:
     # Register global error handler
     app.add_error_handler(error_handler)
 
-    # Фоновая обработка outbox-рассылок (Telegram)
+    # Фоновые задачи: отправка outbox и разворачивание рассылок
     try:
-        interval = getattr(settings, 'BOT_OUTBOX_POLL_SECONDS', 2)
-        app.job_queue.run_repeating(_process_outbox_job, interval=interval, first=2, name='outbox')
+        setup_background_jobs(app)
     except Exception:
         logger.exception("Failed to schedule outbox job")
 
 
-async def _process_outbox_job(context) -> None:
+def build_application(token: str, concurrent_updates: Optional[int] = None) -> Application:
     """
-    JobQueue callback: читает pending outbox и отправляет сообщения через Telegram API.
+    Application с сохранением состояния (BOT_PERSISTENCE) и всеми обработчиками.
+    concurrent_updates — сколько обновлений обрабатывается одновременно (BOT_CONCURRENT_UPDATES);
+    обновления одного чата выполняются строго по очереди.
     """
-    from .utils.db import get_pending_outbox, mark_outbox_sent, mark_outbox_failed
-
-    batch_size = getattr(settings, 'BOT_OUTBOX_BATCH_SIZE', 50)
-    max_attempts = getattr(settings, 'BOT_OUTBOX_MAX_ATTEMPTS', 10)
+    builder = (
+        Application.builder()
+        .token(token)
+        .concurrent_updates(ChatOrderedUpdateProcessor(concurrent_updates))
+    )
+    persistence = build_persistence()
+    if persistence is not None:
+        builder = builder.persistence(persistence)
+    app = builder.build()
+    setup_bot_handlers(app)
+    return app
 
-    items = await get_pending_outbox(batch_size)
-    if not items:
-        return
 
-    bot = context.application.bot
-    for item in items:
-        attempts = (item.attempts or 0) + 1
-        try:
-            await bot.send_message(chat_id=item.chat_id, text=item.message)
-            await mark_outbox_sent(item.id)
-        except RetryAfter as e:
-            # Уважим rate limit: увеличим attempts и оставим pending
-            await mark_outbox_failed(item.id, f"RetryAfter: {e}", attempts, max_attempts)
-        except TelegramError as e:
-            await mark_outbox_failed(item.id, f"TelegramError: {e}", attempts, max_attempts)
-        except Exception as e:
-            await mark_outbox_failed(item.id, f"Exception: {e}", attempts, max_attempts)
+def webhook_secret(token: str) -> str:
+    """
+    Секрет webhook (заголовок X-Telegram-Bot-Api-Secret-Token): BOT_WEBHOOK_SECRET
+    или, если он не задан, производный от токена — одинаковый при каждом запуске.
+    """
+    return settings.BOT_WEBHOOK_SECRET or hashlib.sha256(f'webhook:{token}'.encode()).hexdigest()
@@ -7,7 +7,7 @@ import logging
 
 from ..states import CONTACT_MESSAGE
 from ..messages import BotMessages
-from ..utils.email import send_contact_email
+from ..utils.email import EmailService
 from .start import start
 from django.conf import settings
 
@@ -36,7 +36,7 @@ async def contact_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     email_sent = False
     try:
-        await send_contact_email(subject, body, from_email, [settings.CONTACT_EMAIL_TO])
+        await EmailService.send_contact_email(subject, body, from_email, [settings.CONTACT_EMAIL_TO])
         email_sent = True
     except Exception as exc:
         logger.exception('Failed to send contact email: %s', exc)
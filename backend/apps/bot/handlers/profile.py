@@ -7,7 +7,8 @@ from telegram.ext import ContextTypes
 from ..states import EDIT_FIELD, EDIT_CHOICE, MORE_EDITS
 from ..keyboards import get_edit_fields_keyboard, get_more_edits_keyboard
 from ..messages import BotMessages
-from ..utils.db import get_user_by_telegram_id, update_user_fields, create_profile_log
+from ..utils.db import create_profile_log
+from ..utils.user_cache import get_session_user, update_session_user
 from .start import start
 
 
@@ -42,8 +43,7 @@ async def edit_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Handle edited field input"""
     field = context.user_data.get('edit_field')
     new_value = update.message.text
-    telegram_id = context.user_data.get('telegram_id')
-    user = await get_user_by_telegram_id(telegram_id)
+    user = await get_session_user(context)
     
     field_mapping = {
         'phone': 'phone',
@@ -61,7 +61,7 @@ async def edit_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         new_first = parts[0] if parts else ''
         new_last = parts[1] if len(parts) > 1 else ''
         
-        await update_user_fields(user, first_name=new_first, last_name=new_last)
+        await update_session_user(context, user, first_name=new_first, last_name=new_last)
         
         await create_profile_log(user, 'first_name', old_first, new_first)
         if len(parts) > 1:
@@ -70,7 +70,7 @@ async def edit_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         db_field = field_mapping.get(field)
         if db_field:
             old_value = getattr(user, db_field, None)
-            await update_user_fields(user, **{db_field: new_value})
+            await update_session_user(context, user, **{db_field: new_value})
             
             if field == 'important':
                 await create_profile_log(user, db_field, old_value, new_value)
@@ -95,7 +95,6 @@ async def more_edits(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         # Локальный импорт, чтобы избежать циклического импорта с registration.py
         from .registration import confirm_existing_user
 
-        telegram_id = context.user_data.get('telegram_id')
-        user = await get_user_by_telegram_id(telegram_id)
+        user = await get_session_user(context)
         role = context.user_data.get('role')
         return await confirm_existing_user(update, context, user, role)
@@ -34,15 +34,13 @@ from ..keyboards import (
     get_certificate_choice_keyboard, get_phone_keyboard, get_remove_keyboard,
 )
 from ..messages import BotMessages
+from ..utils.user_cache import get_session_user, remember_session_user
 from ..utils.db import (
     get_competitions,
+    DatabaseService,
     get_competition_by_id,
-    get_user_by_telegram_id,
-    add_user_to_competition,
     update_or_create_new_user,
     create_voter_time_slot,
-    create_registration_request,
-    get_open_roles_for_competition,
 )
 from .start import start
 from .profile import show_edit_options
@@ -63,8 +61,7 @@ async def show_competitions(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return await start(update, context)
     
     if len(competitions) == 1:
-        context.user_data['competition_id'] = competitions[0].id
-        context.user_data['competition_name'] = competitions[0].name
+        _remember_competition(context, competitions[0])
         return await show_roles(update, context)
     
     reply_markup = get_competitions_keyboard(competitions)
@@ -78,6 +75,22 @@ async def show_competitions(update: Update, context: ContextTypes.DEFAULT_TYPE)
     return COMPETITION_SELECT
 
 
+def _remember_competition(context: ContextTypes.DEFAULT_TYPE, comp) -> None:
+    """Запоминает снимок соревнования на время диалога, чтобы следующие шаги не ходили в БД."""
+    context.user_data['competition'] = comp
+    context.user_data['competition_id'] = comp.id
+    context.user_data['competition_name'] = comp.name
+
+
+async def _current_competition(context: ContextTypes.DEFAULT_TYPE):
+    """Снимок выбранного соревнования из user_data (или из кеша, если его там нет)."""
+    comp = context.user_data.get('competition')
+    if comp is None or comp.id != context.user_data.get('competition_id'):
+        comp = await get_competition_by_id(context.user_data.get('competition_id'))
+        _remember_competition(context, comp)
+    return comp
+
+
 async def select_competition(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Handle competition selection"""
     query = update.callback_query
@@ -88,9 +101,7 @@ async def select_competition(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     comp_id = int(query.data.split('_')[1])
     comp = await get_competition_by_id(comp_id)
-    
-    context.user_data['competition_id'] = comp.id
-    context.user_data['competition_name'] = comp.name
+    _remember_competition(context, comp)
     
     return await show_roles(update, context)
 
@@ -99,10 +110,8 @@ async def show_roles(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Show available roles for competition (filtered by entry_open flags)"""
     query = update.callback_query if update.callback_query else None
 
-    comp_id = context.user_data.get('competition_id')
-    comp = await get_competition_by_id(comp_id)
-
-    open_roles = await get_open_roles_for_competition(comp)
+    comp = await _current_competition(context)
+    open_roles = list(comp.open_roles)
 
     if not open_roles:
         text = BotMessages.no_competitions()
@@ -137,7 +146,7 @@ async def select_role(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     telegram_id = context.user_data.get('telegram_id')
     
     try:
-        user = await get_user_by_telegram_id(telegram_id)
+        user = await get_session_user(context, telegram_id)
         return await confirm_existing_user(update, context, user, role)
     except User.DoesNotExist:
         return await register_new_user_start(update, context)
@@ -160,20 +169,18 @@ async def confirm_choice(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await query.answer()
     
     if query.data == 'confirm_yes':
-        telegram_id = context.user_data.get('telegram_id')
-        user = await get_user_by_telegram_id(telegram_id)
         role = context.user_data.get('role')
-        comp_id = context.user_data.get('competition_id')
-        comp_name = context.user_data.get('competition_name')
+        comp = await _current_competition(context)
 
-        comp = await get_competition_by_id(comp_id)
-        await add_user_to_competition(user, comp, role)
-        await create_registration_request(user, comp, role)
+        # Участие в роли и заявка пишутся одной транзакцией
+        user = await DatabaseService.register_for_competition(
+            context.user_data.get('telegram_id'), comp.id, role,
+        )
 
         if role == 'voter':
-            return await start_voter_timeslot_flow(update, context, user, comp_id)
+            return await start_voter_timeslot_flow(update, context, user, comp.id)
 
-        text = BotMessages.registration_success(role, comp_name)
+        text = BotMessages.registration_success(role, comp.name)
         await query.edit_message_text(text=text)
 
         return await start(update, context)
@@ -434,6 +441,7 @@ async def finalize_new_user(update: Update, context: ContextTypes.DEFAULT_TYPE)
         birth_date=None,  # Not requested in new flow
         channel_name=None,  # Not requested in new flow
     )
+    await remember_session_user(context, user)
 
     # Show user data for confirmation (same as existing users)
     role = context.user_data.get('role')
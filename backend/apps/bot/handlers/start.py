@@ -7,7 +7,7 @@ from telegram.ext import ContextTypes
 from ..states import START
 from ..keyboards import get_main_menu_keyboard
 from ..messages import BotMessages
-from ..utils.db import get_or_create_user
+from ..utils.db import DatabaseService
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -16,7 +16,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     chat_id = str(update.effective_chat.id)
 
     try:
-        await get_or_create_user(
+        await DatabaseService.get_or_create_user(
             chat_id=chat_id,
             telegram_id=str(user.id),
             username=user.username,
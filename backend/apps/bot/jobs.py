@@ -0,0 +1,222 @@
+"""
+Фоновые задачи бота (JobQueue): отправка outbox (Telegram и email), разворачивание рассылок,
+архивирование старых строк outbox, статистика соединений с БД и очереди обновлений.
+"""
+import logging
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from telegram.ext import Application
+
+from apps.competitions.cache import competition_cache
+from apps.users.db_stats import connection_stats
+from apps.users.models import NotificationOutbox
+
+from .utils.db import DatabaseService
+from .utils.email import EmailOutboxSender
+from .utils.outbox import CoalescingRunner, OutboxSender, default_worker_id, retry_delay
+from .utils.outbox_listener import create_outbox_listener
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackgroundState:
+    """Состояние фоновой отправки одного процесса бота (передаётся в job.data)."""
+    sender: OutboxSender
+    email_sender: EmailOutboxSender
+    outbox: CoalescingRunner = field(init=False)
+    email_outbox: CoalescingRunner = field(init=False)
+    broadcasts: CoalescingRunner = field(init=False)
+
+    def __post_init__(self) -> None:
+        # Повторные пробуждения во время работы не запускают второй цикл,
+        # а превращаются в ещё один проход
+        self.outbox = CoalescingRunner(
+            lambda: _drain_outbox(self.sender, NotificationOutbox.CHANNEL_TG)
+        )
+        self.email_outbox = CoalescingRunner(
+            lambda: _drain_outbox(self.email_sender, NotificationOutbox.CHANNEL_EMAIL)
+        )
+        self.broadcasts = CoalescingRunner(_expand_broadcasts)
+
+
+def setup_background_jobs(app: Application) -> None:
+    """Регистрирует фоновые задачи outbox и рассылок в JobQueue приложения."""
+    state = BackgroundState(
+        sender=OutboxSender(
+            app.bot,
+            concurrency=getattr(settings, 'BOT_OUTBOX_CONCURRENCY', 30),
+            global_rate=getattr(settings, 'BOT_OUTBOX_GLOBAL_RATE', 30),
+            per_chat_rate=getattr(settings, 'BOT_OUTBOX_PER_CHAT_RATE', 1),
+        ),
+        email_sender=EmailOutboxSender(per_minute=getattr(settings, 'EMAIL_OUTBOX_PER_MINUTE', 0)),
+    )
+    # Опрос — только страховка: основной триггер — LISTEN/NOTIFY
+    interval = getattr(settings, 'BOT_OUTBOX_POLL_SECONDS', 30)
+
+    app.job_queue.run_repeating(_process_outbox_job, interval=interval, first=2, name='outbox', data=state)
+    app.job_queue.run_repeating(
+        _process_email_outbox_job, interval=interval, first=2, name='email-outbox', data=state,
+    )
+    app.job_queue.run_repeating(
+        _process_broadcasts_job, interval=interval, first=2, name='broadcasts', data=state,
+    )
+    app.job_queue.run_once(_start_outbox_listener_job, when=0, name='outbox-listener', data=state)
+    app.job_queue.run_repeating(
+        _reap_outbox_leases_job,
+        interval=getattr(settings, 'BOT_OUTBOX_LEASE_SECONDS', 300),
+        first=5,
+        name='outbox-reaper',
+    )
+    stats_interval = getattr(settings, 'BOT_DB_STATS_LOG_SECONDS', 600)
+    if stats_interval > 0:
+        app.job_queue.run_repeating(_log_db_stats_job, interval=stats_interval, first=stats_interval, name='db-stats')
+    update_stats_interval = getattr(settings, 'BOT_UPDATE_STATS_LOG_SECONDS', 600)
+    if update_stats_interval > 0:
+        app.job_queue.run_repeating(
+            _log_update_stats_job,
+            interval=update_stats_interval,
+            first=update_stats_interval,
+            name='update-stats',
+        )
+    if getattr(settings, 'OUTBOX_RETENTION_DAYS', 30) > 0:
+        app.job_queue.run_repeating(
+            _archive_outbox_job,
+            interval=getattr(settings, 'OUTBOX_RETENTION_INTERVAL_SECONDS', 3600),
+            first=60,
+            name='outbox-retention',
+        )
+
+
+async def _start_outbox_listener_job(context) -> None:
+    """JobQueue callback: подписывается на уведомления о новых строках outbox и рассылках."""
+    job_queue = context.job_queue
+    state: BackgroundState = context.job.data
+
+    def wake() -> None:
+        job_queue.run_once(_process_broadcasts_job, when=0, name='broadcasts-wakeup', data=state)
+        job_queue.run_once(_process_outbox_job, when=0, name='outbox-wakeup', data=state)
+        job_queue.run_once(_process_email_outbox_job, when=0, name='email-outbox-wakeup', data=state)
+
+    listener = create_outbox_listener(wake)
+    await listener.start()
+
+
+async def _reap_outbox_leases_job(context) -> None:
+    """JobQueue callback: возвращает в pending строки, аренда которых истекла (упавший воркер)."""
+    released = await DatabaseService.release_expired_outbox_leases()
+    if released:
+        logger.warning("Released %s outbox rows with expired lease", released)
+
+
+async def _log_db_stats_job(context) -> None:
+    """JobQueue callback: пишет в лог счётчики соединений, пула потоков БД и кеша соревнований."""
+    logger.info("DB connection stats: %s", connection_stats.snapshot())
+    logger.info("Competition cache stats: %s", competition_cache.stats())
+
+
+async def _log_update_stats_job(context) -> None:
+    """JobQueue callback: пишет в лог глубину очереди обновлений и время их ожидания."""
+    application = context.application
+    stats = getattr(application.update_processor, 'stats', None)
+    if stats is not None:
+        logger.info(
+            "Update processing stats: %s, update_queue=%s",
+            stats.snapshot(), application.update_queue.qsize(),
+        )
+
+
+async def _archive_outbox_job(context) -> None:
+    """
+    JobQueue callback: переносит старые sent/failed строки outbox в архив
+    короткими пачками, каждая в своей транзакции.
+    """
+    days = getattr(settings, 'OUTBOX_RETENTION_DAYS', 30)
+    batch_size = getattr(settings, 'OUTBOX_RETENTION_BATCH_SIZE', 1000)
+    total = 0
+    while True:
+        moved = await DatabaseService.archive_outbox_batch(days, batch_size)
+        total += moved
+        if moved < batch_size:
+            break
+    if total:
+        logger.info("Archived %s outbox rows older than %s days", total, days)
+
+
+async def _process_broadcasts_job(context) -> None:
+    """JobQueue callback: разворачивает ожидающие рассылки в outbox пачками."""
+    state: BackgroundState = context.job.data
+    await state.broadcasts.run()
+
+
+async def _expand_broadcasts() -> None:
+    chunk_size = getattr(settings, 'NOTIFY_CHUNK_SIZE', 1000)
+    while await DatabaseService.expand_next_broadcast_chunk(chunk_size):
+        pass
+
+
+async def _process_outbox_job(context) -> None:
+    """
+    JobQueue callback (по NOTIFY и страховочному таймеру): атомарно забирает due-строки
+    outbox пачками (аренда на этот воркер) и отправляет их через OutboxSender
+    (параллельно, с учётом лимитов Telegram), пока очередь не опустеет.
+    """
+    state: BackgroundState = context.job.data
+    await state.outbox.run()
+
+    # После flood-wait продолжим сразу по его окончании, не дожидаясь страховочного опроса
+    if state.sender.paused_for() > 0:
+        context.job_queue.run_once(
+            _process_outbox_job, when=state.sender.paused_for(), name='outbox-resume', data=state,
+        )
+
+
+async def _process_email_outbox_job(context) -> None:
+    """JobQueue callback: отправляет email-строки outbox пачками по одному SMTP-соединению."""
+    state: BackgroundState = context.job.data
+    await state.email_outbox.run()
+
+
+async def _drain_outbox(sender, channel: str) -> None:
+    """
+    Отправляет due-строки outbox канала `channel` пачками до опустошения очереди
+    или flood-wait. `sender` — OutboxSender (Telegram) или EmailOutboxSender.
+    """
+    batch_size = getattr(settings, 'BOT_OUTBOX_BATCH_SIZE', 50)
+    max_attempts = getattr(settings, 'BOT_OUTBOX_MAX_ATTEMPTS', 10)
+    retry_base = getattr(settings, 'BOT_OUTBOX_RETRY_BASE_SECONDS', 5)
+    retry_cap = getattr(settings, 'BOT_OUTBOX_RETRY_MAX_SECONDS', 3600)
+    lease_seconds = getattr(settings, 'BOT_OUTBOX_LEASE_SECONDS', 300)
+    worker_id = getattr(settings, 'BOT_WORKER_ID', '') or default_worker_id()
+
+    while True:
+        # Во время flood-wait не забираем новые строки
+        if sender.paused_for() > 0:
+            return
+
+        # Не больше, чем sender успеет отправить до истечения аренды (лимит писем в минуту)
+        limit = sender.claim_limit(batch_size, lease_seconds)
+        items = await DatabaseService.claim_outbox(worker_id, limit, lease_seconds, channel)
+        if not items:
+            return
+
+        results = await sender.send_many(items)
+        sent_ids = []
+        failures = []
+        for result in results:
+            item = result.item
+            if result.ok:
+                sent_ids.append(item.id)
+            else:
+                # Строки, не отправленные из-за flood-wait, попытку не тратят
+                attempts = (item.attempts or 0) + (1 if result.attempted else 0)
+                retry_in = retry_delay(attempts, result.retry_after, base=retry_base, cap=retry_cap)
+                failures.append((item.id, result.error, attempts, retry_in))
+
+        # Результаты пачки пишем разом: O(1) запросов вместо UPDATE на каждое сообщение
+        await DatabaseService.flush_outbox_results(worker_id, sent_ids, failures, max_attempts)
+
+        # Неудачные строки отложены через next_attempt_at и повторно в этот цикл не попадут
+        if len(items) < limit:
+            return
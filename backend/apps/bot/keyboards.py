@@ -8,7 +8,7 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton,
 from .constants import AVAILABLE_ROLES
 
 if TYPE_CHECKING:
-    from apps.competitions.models import Competition
+    from apps.competitions.cache import CompetitionSnapshot
 
 
 class KeyboardBuilder:
@@ -60,7 +60,7 @@ class KeyboardBuilder:
                 .build())
 
     @staticmethod
-    def competitions(competitions: List["Competition"]) -> InlineKeyboardMarkup:
+    def competitions(competitions: List["CompetitionSnapshot"]) -> InlineKeyboardMarkup:
         """Клавиатура выбора соревнования."""
         builder = KeyboardBuilder()
         for comp in competitions:
@@ -121,7 +121,7 @@ def get_main_menu_keyboard() -> InlineKeyboardMarkup:
     return KeyboardBuilder.main_menu()
 
 
-def get_competitions_keyboard(competitions: List["Competition"]) -> InlineKeyboardMarkup:
+def get_competitions_keyboard(competitions: List["CompetitionSnapshot"]) -> InlineKeyboardMarkup:
     """Клавиатура выбора соревнования."""
     return KeyboardBuilder.competitions(competitions)
 
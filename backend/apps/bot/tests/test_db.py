@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.bot.utils.db import DatabaseService
+from apps.users.models import NotificationOutbox, User
+
+flush_outbox_results = DatabaseService.flush_outbox_results.sync
+
+
+def _flush_batch(size):
+    """Flush a batch of `size` rows: a third sent, a third retried, a third exhausted."""
+    rows = NotificationOutbox.objects.bulk_create([
+        NotificationOutbox(
+            chat_id=str(i), message='hi', status=NotificationOutbox.STATUS_SENDING, claimed_by='w1',
+        )
+        for i in range(size)
+    ])
+    ids = [row.id for row in rows]
+    sent, retried, exhausted = ids[0::3], ids[1::3], ids[2::3]
+    failures = (
+        [(outbox_id, 'TelegramError: timeout', 1, 30.0) for outbox_id in retried]
+        + [(outbox_id, 'TelegramError: blocked', 3, 30.0) for outbox_id in exhausted]
+    )
+    with CaptureQueriesContext(connection) as queries:
+        flush_outbox_results('w1', sent, failures, 3)
+    return len(queries), sent, retried, exhausted
+
+
+@pytest.mark.django_db
+def test_flush_outbox_results_query_count_does_not_depend_on_batch_size():
+    small, *_ = _flush_batch(6)
+    large, sent, retried, exhausted = _flush_batch(60)
+
+    # SAVEPOINT, UPDATE of sent rows, one CASE UPDATE of failures, RELEASE
+    assert small == large == 4
+    statuses = dict(NotificationOutbox.objects.values_list('id', 'status'))
+    assert {statuses[i] for i in sent} == {NotificationOutbox.STATUS_SENT}
+    assert {statuses[i] for i in retried} == {NotificationOutbox.STATUS_PENDING}
+    assert {statuses[i] for i in exhausted} == {NotificationOutbox.STATUS_FAILED}
+    assert not NotificationOutbox.objects.filter(id__in=retried, next_attempt_at__isnull=True).exists()
+
+
+@pytest.mark.django_db
+def test_flush_outbox_results_skips_rows_reclaimed_after_lease_expiry():
+    reclaimed, released = NotificationOutbox.objects.bulk_create([
+        # w1's lease expired: w2 has reclaimed one row, the reaper returned the other to pending
+        NotificationOutbox(chat_id='1', message='hi', status=NotificationOutbox.STATUS_SENDING, claimed_by='w2'),
+        NotificationOutbox(chat_id='2', message='hi', status=NotificationOutbox.STATUS_PENDING),
+    ])
+
+    flush_outbox_results('w1', [reclaimed.id], [(released.id, 'Email: timeout', 1, 30.0)], 3)
+
+    reclaimed.refresh_from_db()
+    released.refresh_from_db()
+    assert (reclaimed.status, reclaimed.claimed_by) == (NotificationOutbox.STATUS_SENDING, 'w2')
+    assert (released.status, released.attempts, released.last_error) == (NotificationOutbox.STATUS_PENDING, 0, None)
+
+
+@pytest.mark.django_db
+def test_update_user_fields_keeps_columns_edited_elsewhere():
+    """A cached User must not revert edits made after it was read (admin, another process)."""
+    cached = User.objects.create(chat_id='1', first_name='Иван', email='old@example.com')
+    User.objects.filter(id=cached.id).update(email='admin@example.com')
+
+    DatabaseService.update_user_fields.sync(cached, phone='+79990000000')
+
+    user = User.objects.get(id=cached.id)
+    assert user.phone == '+79990000000'
+    assert user.email == 'admin@example.com'
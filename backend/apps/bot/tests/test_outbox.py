@@ -0,0 +1,78 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from telegram.error import RetryAfter
+
+from apps.bot.utils.email import EmailOutboxSender
+from apps.bot.utils.outbox import OutboxSender
+
+
+class FakeBot:
+    """Bot.send_message without network: records send times."""
+
+    def __init__(self) -> None:
+        self.sent_at = []
+
+    async def send_message(self, chat_id, text):
+        self.sent_at.append(time.monotonic())
+
+
+def _items(count):
+    return [SimpleNamespace(id=i, chat_id=str(i), message=str(i), attempts=0) for i in range(count)]
+
+
+def test_global_rate_has_no_initial_burst():
+    rate = 50.0
+    bot = FakeBot()
+    sender = OutboxSender(bot, concurrency=30, global_rate=rate, per_chat_rate=100.0)
+
+    results = asyncio.run(sender.send_many(_items(40)))
+
+    assert all(result.ok for result in results)
+    sent_at = sorted(bot.sent_at)
+    # At most one message above the rate in any window, including the first one
+    window = 0.2
+    for i, start in enumerate(sent_at):
+        in_window = sum(1 for t in sent_at[i:] if t - start < window)
+        assert in_window <= rate * window + 1 + 1  # +1 token at start, +1 for timer jitter
+    assert (len(sent_at) - 1) / (sent_at[-1] - sent_at[0]) <= rate * 1.05
+
+
+class FloodBot(FakeBot):
+    """First send_message gets a flood-wait of `retry_after` seconds."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__()
+        self.retry_after = retry_after
+
+    async def send_message(self, chat_id, text):
+        if not self.sent_at:
+            self.sent_at.append(time.monotonic())
+            raise RetryAfter(self.retry_after)
+        await super().send_message(chat_id, text)
+
+
+def test_flood_wait_returns_items_instead_of_sleeping():
+    bot = FloodBot(retry_after=600)
+    sender = OutboxSender(bot, concurrency=1, global_rate=1000.0, per_chat_rate=1000.0)
+
+    started = time.monotonic()
+    results = asyncio.run(sender.send_many(_items(5)))
+
+    # Nobody waits out the 600s pause holding a lease: the batch returns at once
+    assert time.monotonic() - started < 5
+    flooded, *paused = results
+    assert not flooded.ok and flooded.attempted and flooded.retry_after == 600
+    assert all(not r.ok and not r.attempted and 590 < r.retry_after <= 600 for r in paused)
+    assert len(bot.sent_at) == 1
+
+
+def test_email_claim_limit_fits_throttled_batch_into_lease():
+    lease_seconds = 300
+    for per_minute in (1, 6, 60, 6000):
+        limit = EmailOutboxSender(per_minute=per_minute).claim_limit(50, lease_seconds)
+        # Worst case (empty bucket) the batch is sent within the lease
+        assert 1 <= limit <= 50
+        assert limit * 60 / per_minute < lease_seconds
+    assert EmailOutboxSender().claim_limit(50, lease_seconds) == 50
@@ -1,33 +1,104 @@
 """
 Database service for async ORM operations with connection management.
 Implements Single Responsibility Principle by organizing DB operations into logical groups.
+
+ORM calls run in a dedicated thread pool (BOT_DB_THREADS threads) instead of the single
+thread-sensitive executor, so handlers for different chats hit the DB concurrently.
+Each pool thread keeps its own persistent connection (CONN_MAX_AGE).
 """
-from datetime import date, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time, timedelta
 from functools import wraps
-from typing import Callable, List, Optional, Tuple, TypeVar
+from time import monotonic
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
 
 from asgiref.sync import sync_to_async
-from django.db import close_old_connections
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
 from django.utils import timezone
 
+from apps.users.cache import get_version, user_version_key
+from apps.users.db_stats import connection_stats, is_connected
 from apps.users.models import User, ProfileChangeLog, NotificationOutbox, RegistrationRequest
+from apps.users.notifications import expand_next_broadcast_chunk
+from apps.users.outbox_retention import archive_outbox_batch
+from apps.users.outbox_templates import render_outbox_items
+from apps.competitions.cache import CompetitionSnapshot, competition_cache
 from apps.competitions.models import Competition, VoterTimeSlot
 
 T = TypeVar('T')
 
 
+DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'BOT_DB_THREADS', 10),
+    thread_name_prefix='bot-db',
+)
+
+
 def with_db_connection(func: Callable[..., T]) -> Callable[..., T]:
-    """Closes old DB connections before ORM call and ensures cleanup."""
+    """
+    Drops the thread's DB connection before the ORM call if it is broken or older
+    than CONN_MAX_AGE; a healthy connection is reused across calls.
+    """
     @wraps(func)
     def wrapper(*args, **kwargs):
         close_old_connections()
-        try:
-            return func(*args, **kwargs)
-        finally:
-            close_old_connections()
+        connection_stats.record_checkout(reused=is_connected())
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def db_async(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Make a sync ORM function awaitable: it runs in DB_EXECUTOR with connection checks.
+    Time spent waiting for a free pool thread is recorded in connection_stats.
+    The undecorated function stays available as `.sync` (benchmarks, sync callers).
+    """
+    checked = with_db_connection(func)
+
+    def timed(submitted_at: float, *args, **kwargs):
+        connection_stats.record_wait(monotonic() - submitted_at)
+        return checked(*args, **kwargs)
+
+    run = sync_to_async(timed, thread_sensitive=False, executor=DB_EXECUTOR)
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run(monotonic(), *args, **kwargs)
+
+    wrapper.sync = func
     return wrapper
 
 
+# Telegram profile fields synced from every /start
+PROFILE_FIELDS = ('telegram_id', 'username', 'first_name', 'last_name')
+
+# chat_id -> (profile values, user, user version, expires at): the last profile written per chat
+MAX_SEEN_PROFILES = 10_000
+_seen_profiles: Dict[str, Tuple[Tuple[str, ...], User, int, float]] = {}
+
+
+def _remember_profile(chat_id: str, profile: Tuple[str, ...], user: User) -> None:
+    if len(_seen_profiles) >= MAX_SEEN_PROFILES:
+        _seen_profiles.clear()
+    ttl = getattr(settings, 'BOT_PROFILE_CACHE_SECONDS', 600)
+    version = get_version(user_version_key(user.id))
+    _seen_profiles[chat_id] = (profile, user, version, monotonic() + ttl)
+
+
+def _recent_profile_user(chat_id: str, profile: Tuple[str, ...]) -> Optional[User]:
+    """User for `chat_id` if the same profile was synced recently and nobody edited the user since."""
+    entry = _seen_profiles.get(chat_id)
+    if entry is None:
+        return None
+    seen_profile, user, version, expires_at = entry
+    if seen_profile != profile or monotonic() > expires_at or get_version(user_version_key(user.id)) != version:
+        _seen_profiles.pop(chat_id, None)
+        return None
+    return user
+
+
 class DatabaseService:
     """
     Centralized database service for all async ORM operations.
@@ -37,8 +108,7 @@ class DatabaseService:
     # ========== User Operations ==========
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
+    @db_async
     def get_or_create_user(
         chat_id: str,
         telegram_id: str,
@@ -46,34 +116,35 @@ class DatabaseService:
         first_name: Optional[str],
         last_name: Optional[str]
     ) -> User:
-        """Get or create user from chat_id."""
-        db_user, created = User.objects.get_or_create(
-            chat_id=chat_id,
-            defaults={
-                'telegram_id': telegram_id,
-                'username': username or '',
-                'first_name': first_name or '',
-                'last_name': last_name or '',
-            }
-        )
+        """
+        Get or create user from chat_id and sync the Telegram profile fields.
+        Only changed fields are written; a profile already synced for this chat within
+        BOT_PROFILE_CACHE_SECONDS is not even read again.
+        """
+        profile = (telegram_id, username or '', first_name or '', last_name or '')
+        db_user = _recent_profile_user(chat_id, profile)
+        if db_user is not None:
+            return db_user
+
+        values = dict(zip(PROFILE_FIELDS, profile))
+        db_user, created = User.objects.get_or_create(chat_id=chat_id, defaults=values)
         if not created:
-            db_user.telegram_id = telegram_id
-            db_user.username = username or ''
-            db_user.first_name = first_name or ''
-            db_user.last_name = last_name or ''
-            db_user.save()
+            changed = [field for field, value in values.items() if getattr(db_user, field) != value]
+            if changed:
+                for field in changed:
+                    setattr(db_user, field, values[field])
+                db_user.save(update_fields=changed + ['updated_at'])
+        _remember_profile(chat_id, profile, db_user)
         return db_user
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
+    @db_async
     def get_user_by_telegram_id(telegram_id: str) -> User:
         """Get user by telegram_id or raise DoesNotExist."""
         return User.objects.get(telegram_id=telegram_id)
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
+    @db_async
     def update_or_create_new_user(
         chat_id: str,
         telegram_id: str,
@@ -122,77 +193,98 @@ class DatabaseService:
         return user
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
+    @db_async
     def update_user_fields(user: User, **kwargs) -> User:
-        """Update user fields and save."""
+        """
+        Update and save only the given fields: `user` may be a cached copy, and a full
+        save would overwrite columns edited elsewhere (admin, API) since it was read.
+        """
         for key, value in kwargs.items():
             setattr(user, key, value)
-        user.save()
+        user.save(update_fields=[*kwargs, 'updated_at'])
         return user
 
     # ========== Competition Operations ==========
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
-    def get_competitions() -> List[Competition]:
-        """Get all competitions."""
-        return list(Competition.objects.all())
+    @db_async
+    def get_competitions() -> List[CompetitionSnapshot]:
+        """Get all competitions (id, name and entry_open_* flags; cached, see competition_cache)."""
+        return competition_cache.all()
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
-    def get_competition_by_id(comp_id: int) -> Competition:
-        """Get competition by ID."""
-        return Competition.objects.get(id=comp_id)
+    @db_async
+    def get_competition_by_id(comp_id: int) -> CompetitionSnapshot:
+        """Get competition by ID from the competition cache (raises DoesNotExist)."""
+        return competition_cache.get(comp_id)
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
-    def get_open_competitions_for_role(role: str) -> List[Competition]:
+    @db_async
+    def get_open_competitions_for_role(role: str) -> List[CompetitionSnapshot]:
         """Get competitions with registration open for the given role."""
-        filter_field = f'entry_open_{role}'
-        return list(Competition.objects.filter(**{filter_field: True}))
+        return [comp for comp in competition_cache.all() if role in comp.open_roles]
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
-    def get_open_roles_for_competition(competition: Competition) -> List[str]:
-        """Get list of roles with open registration for this competition."""
-        competition = Competition.objects.get(id=competition.id)
-        roles: List[str] = []
-        if competition.entry_open_player:
-            roles.append('player')
-        if competition.entry_open_voter:
-            roles.append('voter')
-        if competition.entry_open_viewer:
-            roles.append('viewer')
-        if competition.entry_open_adviser:
-            roles.append('adviser')
-        return roles
+    @db_async
+    def get_open_roles_for_competition(competition: CompetitionSnapshot) -> List[str]:
+        """Get list of roles with open registration for this competition (prefer snapshot.open_roles)."""
+        return list(competition_cache.get(competition.id).open_roles)
 
     # ========== Competition-User Relationship Operations ==========
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
-    def add_user_to_competition(user: User, comp: Competition, role: str) -> None:
-        """Add user to competition's role list."""
+    @db_async
+    def add_user_to_competition(user: User, comp: CompetitionSnapshot, role: str) -> None:
+        """Add user to competition's role list (only comp.id is used)."""
+        comp = Competition(id=comp.id)
         if role == 'player':
-            comp.arbitrators.add(user)
+            comp.arbitrators.add(user.id)
         elif role == 'voter':
-            comp.voters.add(user)
+            comp.voters.add(user.id)
         elif role == 'viewer':
-            comp.viewers.add(user)
+            comp.viewers.add(user.id)
         elif role == 'adviser':
-            comp.advisers.add(user)
+            comp.advisers.add(user.id)
+
+    @staticmethod
+    @db_async
+    def register_for_competition(telegram_id: str, comp_id: int, role: str) -> User:
+        """
+        Register the user for a competition in one transaction: role membership (M2M)
+        and the RegistrationRequest either both exist or neither does.
+        Four statements: SELECT user, two INSERT ... ON CONFLICT DO NOTHING and an UPDATE of
+        Competition.updated_at (the through insert bypasses m2m_changed; the API ETag depends on it).
+        """
+        field_name = Competition.ROLE_FIELDS.get(role)
+        if field_name is None:
+            raise ValueError(f"Unknown role: {role}")
+        through = Competition._meta.get_field(field_name).remote_field.through
+
+        with transaction.atomic():
+            user = User.objects.get(telegram_id=telegram_id)
+            through.objects.bulk_create(
+                [through(competition_id=comp_id, user_id=user.id)],
+                ignore_conflicts=True,
+            )
+            Competition.touch([comp_id])
+            RegistrationRequest.objects.bulk_create(
+                [RegistrationRequest(
+                    user=user,
+                    competition_id=comp_id,
+                    role=role,
+                    user_first_name=user.first_name or '',
+                    user_last_name=user.last_name or '',
+                    user_email=user.email or '',
+                    user_phone=user.phone or '',
+                )],
+                ignore_conflicts=True,
+            )
+        return user
 
     # ========== Profile Audit Log Operations ==========
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
+    @db_async
     def create_profile_log(user: User, field_name: str, old_value: str, new_value: str) -> ProfileChangeLog:
         """Create profile change log entry."""
         return ProfileChangeLog.objects.create(
@@ -205,13 +297,12 @@ class DatabaseService:
     # ========== Registration Request Operations ==========
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
-    def create_registration_request(user: User, competition: Competition, role: str) -> Tuple[RegistrationRequest, bool]:
+    @db_async
+    def create_registration_request(user: User, competition: CompetitionSnapshot, role: str) -> Tuple[RegistrationRequest, bool]:
         """Create registration request (returns existing if already created)."""
         request, created = RegistrationRequest.objects.get_or_create(
             user=user,
-            competition=competition,
+            competition_id=competition.id,
             role=role,
             defaults={
                 'user_first_name': user.first_name or '',
@@ -225,8 +316,7 @@ class DatabaseService:
     # ========== Voter Time Slot Operations ==========
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
+    @db_async
     def create_voter_time_slot(
         competition_id: int,
         voter_id: int,
@@ -248,95 +338,207 @@ class DatabaseService:
     # ========== Notification Outbox Operations ==========
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
+    @db_async
     def get_pending_outbox(limit: int) -> List[NotificationOutbox]:
-        """Get batch of pending notifications (assumes single bot instance)."""
-        return list(
+        """Get batch of pending notifications that are due (read-only; use claim_outbox to send)."""
+        items = list(
             NotificationOutbox.objects
             .filter(status=NotificationOutbox.STATUS_PENDING)
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=timezone.now()))
             .order_by('created_at')[:limit]
         )
+        render_outbox_items(items)
+        return items
+
+    @staticmethod
+    @db_async
+    def claim_outbox(
+        worker_id: str,
+        limit: int,
+        lease_seconds: int,
+        channel: str = NotificationOutbox.CHANNEL_TG,
+    ) -> List[NotificationOutbox]:
+        """
+        Atomically claim a batch of due notifications of `channel` for this worker.
+        Rows are locked with FOR UPDATE SKIP LOCKED (Postgres), so N bot instances
+        never get the same row; claimed rows move to `sending` with a lease.
+        Template rows get their message/subject rendered for the recipient.
+        """
+        now = timezone.now()
+        lease_until = now + timedelta(seconds=lease_seconds)
+        with transaction.atomic():
+            items = list(
+                NotificationOutbox.objects
+                .select_for_update(skip_locked=True)
+                .filter(status=NotificationOutbox.STATUS_PENDING, channel=channel)
+                .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+                .order_by('created_at')[:limit]
+            )
+            if not items:
+                return []
+            NotificationOutbox.objects.filter(id__in=[item.id for item in items]).update(
+                status=NotificationOutbox.STATUS_SENDING,
+                claimed_by=worker_id,
+                lease_until=lease_until,
+            )
+        for item in items:
+            item.status = NotificationOutbox.STATUS_SENDING
+            item.claimed_by = worker_id
+            item.lease_until = lease_until
+        render_outbox_items(items)
+        return items
+
+    @staticmethod
+    @db_async
+    def release_expired_outbox_leases() -> int:
+        """Return `sending` rows with an expired lease (crashed worker) back to pending."""
+        return NotificationOutbox.objects.filter(
+            status=NotificationOutbox.STATUS_SENDING,
+            lease_until__lt=timezone.now(),
+        ).update(
+            status=NotificationOutbox.STATUS_PENDING,
+            claimed_by=None,
+            lease_until=None,
+        )
+
+    @staticmethod
+    @db_async
+    def flush_outbox_results(
+        worker_id: str,
+        sent_ids: List[int],
+        failures: List[Tuple[int, str, int, float]],
+        max_attempts: int,
+    ) -> None:
+        """
+        Persist results of a whole batch with set-based statements:
+        one UPDATE ... WHERE id IN (...) for sent rows and one CASE-based bulk update
+        for failures given as (outbox_id, error, attempts, retry_in) tuples.
+        Only rows still `sending` under this worker's claim are updated: a row whose
+        lease expired may already be pending again or claimed by another worker.
+        """
+        now = timezone.now()
+        claimed = NotificationOutbox.objects.filter(
+            status=NotificationOutbox.STATUS_SENDING,
+            claimed_by=worker_id,
+        )
+        with transaction.atomic():
+            if sent_ids:
+                claimed.filter(id__in=sent_ids).update(
+                    status=NotificationOutbox.STATUS_SENT,
+                    sent_at=now,
+                    last_error=None,
+                    next_attempt_at=None,
+                    claimed_by=None,
+                    lease_until=None,
+                )
+            if failures:
+                rows = []
+                for outbox_id, error, attempts, retry_in in failures:
+                    exhausted = attempts >= max_attempts
+                    rows.append(NotificationOutbox(
+                        id=outbox_id,
+                        status=NotificationOutbox.STATUS_FAILED if exhausted else NotificationOutbox.STATUS_PENDING,
+                        attempts=attempts,
+                        last_error=error[:5000],
+                        next_attempt_at=None if exhausted else now + timedelta(seconds=retry_in),
+                        claimed_by=None,
+                        lease_until=None,
+                    ))
+                claimed.bulk_update(
+                    rows,
+                    ['status', 'attempts', 'last_error', 'next_attempt_at', 'claimed_by', 'lease_until'],
+                )
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
+    @db_async
     def mark_outbox_sent(outbox_id: int) -> None:
         """Mark notification as sent."""
         NotificationOutbox.objects.filter(id=outbox_id).update(
             status=NotificationOutbox.STATUS_SENT,
             sent_at=timezone.now(),
             last_error=None,
+            next_attempt_at=None,
+            claimed_by=None,
+            lease_until=None,
         )
 
     @staticmethod
-    @sync_to_async
-    @with_db_connection
-    def mark_outbox_failed(outbox_id: int, error: str, attempts: int, max_attempts: int) -> None:
-        """Mark notification as failed, or retry if under max attempts."""
-        new_status = NotificationOutbox.STATUS_FAILED if attempts >= max_attempts else NotificationOutbox.STATUS_PENDING
+    @db_async
+    def mark_outbox_failed(
+        outbox_id: int,
+        error: str,
+        attempts: int,
+        max_attempts: int,
+        retry_in: float = 0,
+    ) -> None:
+        """Mark notification as failed, or schedule a retry in `retry_in` seconds if under max attempts."""
+        exhausted = attempts >= max_attempts
         NotificationOutbox.objects.filter(id=outbox_id).update(
-            status=new_status,
+            status=NotificationOutbox.STATUS_FAILED if exhausted else NotificationOutbox.STATUS_PENDING,
             attempts=attempts,
             last_error=error[:5000],
+            next_attempt_at=None if exhausted else timezone.now() + timedelta(seconds=retry_in),
+            claimed_by=None,
+            lease_until=None,
         )
 
+    # ========== Broadcast Operations ==========
+
+    @staticmethod
+    @db_async
+    def expand_next_broadcast_chunk(chunk_size: int) -> bool:
+        """Expand the next chunk of recipients of a pending broadcast into the outbox."""
+        return expand_next_broadcast_chunk(chunk_size)
+
+    @staticmethod
+    @db_async
+    def archive_outbox_batch(days: int, batch_size: int) -> int:
+        """Move one batch of sent/failed outbox rows older than `days` into the archive."""
+        return archive_outbox_batch(days, batch_size)
+
 
 # ========== Backward Compatibility Wrappers ==========
 # These maintain the old API for existing code that hasn't been refactored yet.
 
-@sync_to_async
-@with_db_connection
+@db_async
 def get_or_create_user(chat_id: str, telegram_id: str, username: Optional[str], first_name: Optional[str], last_name: Optional[str]) -> User:
     """Deprecated: Use DatabaseService.get_or_create_user instead."""
-    return User.objects.get_or_create(
-        chat_id=chat_id,
-        defaults={
-            'telegram_id': telegram_id,
-            'username': username or '',
-            'first_name': first_name or '',
-            'last_name': last_name or '',
-        }
-    )[0]
+    return DatabaseService.get_or_create_user.sync(chat_id, telegram_id, username, first_name, last_name)
 
 
-@sync_to_async
-@with_db_connection
-def get_competitions() -> List[Competition]:
+@db_async
+def get_competitions() -> List[CompetitionSnapshot]:
     """Deprecated: Use DatabaseService.get_competitions instead."""
-    return list(Competition.objects.all())
+    return competition_cache.all()
 
 
-@sync_to_async
-@with_db_connection
-def get_competition_by_id(comp_id: int) -> Competition:
+@db_async
+def get_competition_by_id(comp_id: int) -> CompetitionSnapshot:
     """Deprecated: Use DatabaseService.get_competition_by_id instead."""
-    return Competition.objects.get(id=comp_id)
+    return competition_cache.get(comp_id)
 
 
-@sync_to_async
-@with_db_connection
+@db_async
 def get_user_by_telegram_id(telegram_id: str) -> User:
     """Deprecated: Use DatabaseService.get_user_by_telegram_id instead."""
     return User.objects.get(telegram_id=telegram_id)
 
 
-@sync_to_async
-@with_db_connection
-def add_user_to_competition(user: User, comp: Competition, role: str) -> None:
+@db_async
+def add_user_to_competition(user: User, comp: CompetitionSnapshot, role: str) -> None:
     """Deprecated: Use DatabaseService.add_user_to_competition instead."""
+    comp = Competition(id=comp.id)
     if role == 'player':
-        comp.arbitrators.add(user)
+        comp.arbitrators.add(user.id)
     elif role == 'voter':
-        comp.voters.add(user)
+        comp.voters.add(user.id)
     elif role == 'viewer':
-        comp.viewers.add(user)
+        comp.viewers.add(user.id)
     elif role == 'adviser':
-        comp.advisers.add(user)
+        comp.advisers.add(user.id)
 
 
-@sync_to_async
-@with_db_connection
+@db_async
 def update_or_create_new_user(
     chat_id: str,
     telegram_id: str,
@@ -385,8 +587,7 @@ def update_or_create_new_user(
     return user
 
 
-@sync_to_async
-@with_db_connection
+@db_async
 def create_profile_log(user: User, field_name: str, old_value: str, new_value: str) -> ProfileChangeLog:
     """Deprecated: Use DatabaseService.create_profile_log instead."""
     return ProfileChangeLog.objects.create(
@@ -397,52 +598,62 @@ def create_profile_log(user: User, field_name: str, old_value: str, new_value: s
     )
 
 
-@sync_to_async
-@with_db_connection
+@db_async
 def update_user_fields(user: User, **kwargs) -> User:
     """Deprecated: Use DatabaseService.update_user_fields instead."""
     for key, value in kwargs.items():
         setattr(user, key, value)
-    user.save()
+    user.save(update_fields=[*kwargs, 'updated_at'])
     return user
 
 
-@sync_to_async
-@with_db_connection
+@db_async
 def get_pending_outbox(limit: int) -> List[NotificationOutbox]:
     """Deprecated: Use DatabaseService.get_pending_outbox instead."""
-    return list(
+    items = list(
         NotificationOutbox.objects
         .filter(status=NotificationOutbox.STATUS_PENDING)
+        .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=timezone.now()))
         .order_by('created_at')[:limit]
     )
+    render_outbox_items(items)
+    return items
 
 
-@sync_to_async
-@with_db_connection
+@db_async
 def mark_outbox_sent(outbox_id: int) -> None:
     """Deprecated: Use DatabaseService.mark_outbox_sent instead."""
     NotificationOutbox.objects.filter(id=outbox_id).update(
         status=NotificationOutbox.STATUS_SENT,
         sent_at=timezone.now(),
         last_error=None,
+        next_attempt_at=None,
+        claimed_by=None,
+        lease_until=None,
     )
 
 
-@sync_to_async
-@with_db_connection
-def mark_outbox_failed(outbox_id: int, error: str, attempts: int, max_attempts: int) -> None:
+@db_async
+def mark_outbox_failed(
+    outbox_id: int,
+    error: str,
+    attempts: int,
+    max_attempts: int,
+    retry_in: float = 0,
+) -> None:
     """Deprecated: Use DatabaseService.mark_outbox_failed instead."""
-    new_status = NotificationOutbox.STATUS_FAILED if attempts >= max_attempts else NotificationOutbox.STATUS_PENDING
+    exhausted = attempts >= max_attempts
     NotificationOutbox.objects.filter(id=outbox_id).update(
-        status=new_status,
+        status=NotificationOutbox.STATUS_FAILED if exhausted else NotificationOutbox.STATUS_PENDING,
         attempts=attempts,
         last_error=error[:5000],
+        next_attempt_at=None if exhausted else timezone.now() + timedelta(seconds=retry_in),
+        claimed_by=None,
+        lease_until=None,
     )
 
 
-@sync_to_async
-@with_db_connection
+@db_async
 def create_voter_time_slot(
     competition_id: int,
     voter_id: int,
@@ -462,13 +673,12 @@ def create_voter_time_slot(
     )
 
 
-@sync_to_async
-@with_db_connection
-def create_registration_request(user: User, competition: Competition, role: str) -> Tuple[RegistrationRequest, bool]:
+@db_async
+def create_registration_request(user: User, competition: CompetitionSnapshot, role: str) -> Tuple[RegistrationRequest, bool]:
     """Deprecated: Use DatabaseService.create_registration_request instead."""
     request, created = RegistrationRequest.objects.get_or_create(
         user=user,
-        competition=competition,
+        competition_id=competition.id,
         role=role,
         defaults={
             'user_first_name': user.first_name or '',
@@ -480,26 +690,13 @@ def create_registration_request(user: User, competition: Competition, role: str)
     return request, created
 
 
-@sync_to_async
-@with_db_connection
-def get_open_competitions_for_role(role: str) -> List[Competition]:
+@db_async
+def get_open_competitions_for_role(role: str) -> List[CompetitionSnapshot]:
     """Deprecated: Use DatabaseService.get_open_competitions_for_role instead."""
-    filter_field = f'entry_open_{role}'
-    return list(Competition.objects.filter(**{filter_field: True}))
+    return [comp for comp in competition_cache.all() if role in comp.open_roles]
 
 
-@sync_to_async
-@with_db_connection
-def get_open_roles_for_competition(competition: Competition) -> List[str]:
+@db_async
+def get_open_roles_for_competition(competition: CompetitionSnapshot) -> List[str]:
     """Deprecated: Use DatabaseService.get_open_roles_for_competition instead."""
-    competition = Competition.objects.get(id=competition.id)
-    roles: List[str] = []
-    if competition.entry_open_player:
-        roles.append('player')
-    if competition.entry_open_voter:
-        roles.append('voter')
-    if competition.entry_open_viewer:
-        roles.append('viewer')
-    if competition.entry_open_adviser:
-        roles.append('adviser')
-    return roles
+    return list(competition_cache.get(competition.id).open_roles)
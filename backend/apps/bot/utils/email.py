@@ -3,12 +3,14 @@ Email service for sending async emails.
 Implements Single Responsibility Principle for email operations.
 """
 import logging
-from typing import List
+from typing import Iterable, List
 
 from asgiref.sync import sync_to_async
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection, send_mail
 from django.conf import settings
 
+from .outbox import SendResult, TokenBucket
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,15 +21,80 @@ class EmailService:
     """
 
     @staticmethod
-    @sync_to_async
+    @sync_to_async(thread_sensitive=False)
     def send_contact_email(subject: str, message: str, from_email: str, recipient_list: List[str]) -> int:
         """Send contact email using Django's send_mail backend."""
         return send_mail(subject, message, from_email, recipient_list, fail_silently=False)
 
+    @staticmethod
+    @sync_to_async(thread_sensitive=False)
+    def send_outbox_batch(items: List) -> List[SendResult]:
+        """
+        Send a batch of email outbox items over a single SMTP connection
+        (one handshake per batch instead of one per recipient).
+        """
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            logger.exception("Failed to open SMTP connection")
+            return [SendResult(item, ok=False, error=f"SMTP connect: {e}") for item in items]
+
+        results = []
+        try:
+            for item in items:
+                message = EmailMessage(
+                    item.subject,
+                    item.message,
+                    settings.DEFAULT_FROM_EMAIL,
+                    [item.email],
+                    connection=connection,
+                )
+                try:
+                    connection.send_messages([message])
+                    results.append(SendResult(item, ok=True))
+                except Exception as e:
+                    results.append(SendResult(item, ok=False, error=f"Email: {e}"))
+        finally:
+            connection.close()
+        return results
+
+
+class EmailOutboxSender:
+    """
+    Sends email outbox batches via EmailService.send_outbox_batch, throttled to
+    `per_minute` messages per minute (provider cap; 0 disables the limit).
+    Same interface as OutboxSender so the outbox drain loop can use either.
+    """
+
+    def __init__(self, per_minute: int = 0) -> None:
+        self.per_minute = per_minute
+        self._bucket = TokenBucket(per_minute / 60, capacity=per_minute) if per_minute else None
+
+    def claim_limit(self, batch_size: int, lease_seconds: float) -> int:
+        """
+        Rows to claim per batch. With an empty bucket a batch of n takes 60 * n / per_minute
+        seconds; it has to be sent within the lease (half of it, leaving the rest for SMTP),
+        or the rows are reclaimed by another worker and sent twice.
+        """
+        if not self.per_minute:
+            return batch_size
+        return max(1, min(batch_size, int(self.per_minute * lease_seconds / 120)))
+
+    def paused_for(self) -> float:
+        return 0.0
+
+    async def send_many(self, items: Iterable) -> List[SendResult]:
+        items = list(items)
+        if self._bucket is not None:
+            for _ in items:
+                await self._bucket.acquire()
+        return await EmailService.send_outbox_batch(items)
+
 
 # ========== Backward Compatibility Wrapper ==========
 
-@sync_to_async
+@sync_to_async(thread_sensitive=False)
 def send_contact_email(subject: str, message: str, from_email: str, recipient_list: List[str]) -> int:
     """Deprecated: Use EmailService.send_contact_email instead."""
     return send_mail(subject, message, from_email, recipient_list, fail_silently=False)
\ No newline at end of file
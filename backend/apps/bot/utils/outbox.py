@@ -0,0 +1,194 @@
+"""
+Outbox sender engine: delivers NotificationOutbox rows through the Telegram API
+with bounded concurrency under a global and a per-chat rate limit.
+"""
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from telegram.error import RetryAfter, TelegramError
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Async token bucket: refills `rate` tokens per second up to `capacity`.
+    Waiters are served in FIFO order.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(self.rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def is_idle(self) -> bool:
+        """True if the bucket is full and nobody waits on it (safe to drop)."""
+        self._refill(time.monotonic())
+        return self._tokens >= self.capacity and not self._lock.locked()
+
+
+def default_worker_id() -> str:
+    """Identifier of this bot process for outbox leases: host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def retry_delay(
+    attempts: int,
+    retry_after: Optional[float] = None,
+    base: float = 5.0,
+    cap: float = 3600.0,
+) -> float:
+    """
+    Seconds to wait before the next attempt: the exact server delay for RetryAfter,
+    otherwise exponential backoff (base * 2^(attempts-1), capped) with jitter.
+    """
+    if retry_after is not None:
+        return float(retry_after)
+    delay = min(cap, base * 2 ** max(0, attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CoalescingRunner:
+    """
+    Runs an async callable at most once at a time. Calls that arrive while it is
+    running are coalesced into a single extra pass once the current one finishes.
+    """
+
+    def __init__(self, func: Callable[[], Awaitable[None]]) -> None:
+        self.func = func
+        self._running = False
+        self._rerun = False
+
+    async def run(self) -> None:
+        if self._running:
+            self._rerun = True
+            return
+        self._running = True
+        try:
+            while True:
+                self._rerun = False
+                await self.func()
+                if not self._rerun:
+                    return
+        finally:
+            self._running = False
+
+
+@dataclass
+class SendResult:
+    """Outcome of a single outbox delivery attempt."""
+    item: object
+    ok: bool
+    error: Optional[str] = None
+    retry_after: Optional[float] = None
+    # False if the item was not sent at all (flood-wait): the attempt does not count
+    attempted: bool = True
+
+
+class OutboxSender:
+    """
+    Sends outbox items concurrently while respecting Telegram limits:
+    at most `concurrency` requests in flight, `global_rate` messages per second
+    overall and `per_chat_rate` messages per second to a single chat.
+    """
+
+    # Per-chat buckets are pruned once the map grows beyond this size
+    MAX_IDLE_CHAT_BUCKETS = 10_000
+
+    def __init__(
+        self,
+        bot,
+        concurrency: int = 30,
+        global_rate: float = 30.0,
+        per_chat_rate: float = 1.0,
+    ) -> None:
+        self.bot = bot
+        self.per_chat_rate = per_chat_rate
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        # Capacity 1: no initial burst, so no window ever exceeds global_rate (+1 message)
+        self._global_bucket = TokenBucket(global_rate, capacity=1)
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._paused_until = 0.0
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= self.MAX_IDLE_CHAT_BUCKETS:
+                self._prune_chat_buckets()
+            bucket = TokenBucket(self.per_chat_rate, capacity=1)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _prune_chat_buckets(self) -> None:
+        for chat_id in [cid for cid, b in self._chat_buckets.items() if b.is_idle()]:
+            del self._chat_buckets[chat_id]
+
+    def claim_limit(self, batch_size: int, lease_seconds: float) -> int:
+        """Rows to claim per batch: a full batch is sent well within the lease."""
+        return batch_size
+
+    def paused_for(self) -> float:
+        """Seconds left of the global flood-wait pause (0 if not paused)."""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def pause(self, seconds: float) -> None:
+        """Pause all sending for `seconds` (extends, never shortens, an active pause)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def send_many(self, items: Iterable) -> List[SendResult]:
+        """Deliver all items concurrently; returns results in input order."""
+        return list(await asyncio.gather(*(self._send_one(item) for item in items)))
+
+    def _paused_result(self, item) -> SendResult:
+        return SendResult(
+            item, ok=False, error="Flood wait", retry_after=self.paused_for(), attempted=False,
+        )
+
+    async def _send_one(self, item) -> SendResult:
+        # Пока действует flood-wait, не шлём ничего: один 429 не должен превратиться в 50.
+        # Строка не ждёт паузу с арендой на руках, а возвращается в pending с next_attempt_at.
+        if self.paused_for() > 0:
+            return self._paused_result(item)
+        # Ждём per-chat токен до захвата слота, чтобы медленный чат не занимал семафор
+        await self._chat_bucket(str(item.chat_id)).acquire()
+        async with self._semaphore:
+            await self._global_bucket.acquire()
+            if self.paused_for() > 0:
+                return self._paused_result(item)
+            try:
+                await self.bot.send_message(chat_id=item.chat_id, text=item.message)
+            except RetryAfter as e:
+                retry_after = float(e.retry_after)
+                self.pause(retry_after)
+                logger.warning("Flood wait: pausing outbox sender for %.0fs", retry_after)
+                return SendResult(item, ok=False, error=f"RetryAfter: {e}", retry_after=retry_after)
+            except TelegramError as e:
+                return SendResult(item, ok=False, error=f"TelegramError: {e}")
+            except Exception as e:
+                logger.exception("Unexpected error while sending outbox item %s", getattr(item, 'id', None))
+                return SendResult(item, ok=False, error=f"Exception: {e}")
+        return SendResult(item, ok=True)
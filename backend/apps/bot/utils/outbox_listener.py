@@ -0,0 +1,109 @@
+"""
+Async listeners that wake the outbox sender as soon as new rows are inserted:
+Postgres LISTEN/NOTIFY in production, the in-process notifier for SQLite/tests.
+"""
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from django.conf import settings
+
+from apps.users.outbox_notify import (
+    BACKEND_MEMORY,
+    OUTBOX_CHANNEL,
+    memory_notifier,
+    outbox_notify_backend,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresOutboxListener:
+    """
+    Keeps a dedicated psycopg2 connection in LISTEN mode and calls `on_wake`
+    from the event loop on every NOTIFY. Reconnects after `reconnect_delay` on errors.
+    """
+
+    def __init__(self, on_wake: Callable[[], None], reconnect_delay: float = 5.0) -> None:
+        self.on_wake = on_wake
+        self.reconnect_delay = reconnect_delay
+        self._conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        try:
+            self._conn = await asyncio.to_thread(self._connect)
+        except Exception:
+            logger.exception("Outbox LISTEN connection failed, retrying in %ss", self.reconnect_delay)
+            self._schedule_reconnect()
+            return
+        self._loop.add_reader(self._conn.fileno(), self._on_readable)
+        logger.info("Listening for outbox notifications on channel %s", OUTBOX_CHANNEL)
+        # Пока соединения не было, NOTIFY могли пропустить — проверим outbox сразу
+        self.on_wake()
+
+    def stop(self) -> None:
+        if self._conn is not None:
+            if self._loop is not None:
+                self._loop.remove_reader(self._conn.fileno())
+            self._conn.close()
+            self._conn = None
+
+    def _connect(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        db = settings.DATABASES['default']
+        conn = psycopg2.connect(
+            dbname=db['NAME'],
+            user=db['USER'],
+            password=db['PASSWORD'],
+            host=getattr(settings, 'OUTBOX_LISTEN_HOST', db['HOST']),
+            port=getattr(settings, 'OUTBOX_LISTEN_PORT', db['PORT']),
+        )
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN {OUTBOX_CHANNEL}')
+        return conn
+
+    def _on_readable(self) -> None:
+        try:
+            self._conn.poll()
+        except Exception:
+            logger.warning("Outbox LISTEN connection lost, reconnecting", exc_info=True)
+            self.stop()
+            self._schedule_reconnect()
+            return
+        if self._conn.notifies:
+            self._conn.notifies.clear()
+            self.on_wake()
+
+    def _schedule_reconnect(self) -> None:
+        self._loop.call_later(self.reconnect_delay, lambda: asyncio.ensure_future(self.start()))
+
+
+class InMemoryOutboxListener:
+    """Subscribes to the in-process notifier (SQLite, tests, API and bot in one process)."""
+
+    def __init__(self, on_wake: Callable[[], None]) -> None:
+        self.on_wake = on_wake
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        memory_notifier.subscribe(self._notify)
+
+    def stop(self) -> None:
+        memory_notifier.unsubscribe(self._notify)
+
+    def _notify(self) -> None:
+        # notify() может прийти из потока API/ORM — переносим вызов в event loop бота
+        self._loop.call_soon_threadsafe(self.on_wake)
+
+
+def create_outbox_listener(on_wake: Callable[[], None]):
+    """Listener matching OUTBOX_NOTIFY_BACKEND (or the database vendor)."""
+    if outbox_notify_backend() == BACKEND_MEMORY:
+        return InMemoryOutboxListener(on_wake)
+    return PostgresOutboxListener(on_wake)
@@ -0,0 +1,234 @@
+"""
+Bot state persistence: context.user_data and ConversationHandler states survive restarts,
+so users in the middle of a registration continue where they stopped.
+
+PTB calls the persistence once per BOT_PERSISTENCE_INTERVAL seconds with only the entries
+changed since the previous run (and once more on shutdown). Updates are coalesced in memory
+and written by one background task per run: a single transaction with one upsert and one
+delete per kind, instead of a write per message.
+
+    BOT_PERSISTENCE=db    -> DjangoPersistence (BotState table, production)
+    BOT_PERSISTENCE=file  -> FilePersistence (pickle file, local development)
+"""
+import asyncio
+import json
+import logging
+import pickle
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from telegram.ext import BasePersistence, PersistenceInput, PicklePersistence
+
+from apps.users.models import BotState
+
+from .db import db_async
+
+logger = logging.getLogger(__name__)
+
+# Only user_data and conversation states are used by the handlers
+STORE_DATA = PersistenceInput(bot_data=False, chat_data=False, callback_data=False)
+
+# Marker for entries that must be deleted (dropped user_data, finished conversations)
+_DELETE = object()
+
+StateKey = Tuple[str, str]
+
+
+def _conversation_kind(name: str) -> str:
+    return f'{BotState.KIND_CONVERSATION_PREFIX}{name}'
+
+
+def _conversation_key(key: Tuple[int, ...]) -> str:
+    return json.dumps(list(key))
+
+
+@db_async
+def _load_states() -> Dict[str, Dict[str, Any]]:
+    """All stored states grouped by kind; rows that cannot be unpickled are skipped."""
+    states: Dict[str, Dict[str, Any]] = defaultdict(dict)
+    for kind, key, data in BotState.objects.values_list('kind', 'key', 'data').iterator():
+        try:
+            states[kind][key] = pickle.loads(data)
+        except Exception:
+            logger.warning("Skipping unreadable bot state %s:%s", kind, key, exc_info=True)
+    return states
+
+
+@db_async
+def _write_states(entries: Dict[StateKey, Any]) -> None:
+    """Upsert changed entries and delete dropped ones in one transaction."""
+    rows: List[BotState] = []
+    deleted: Dict[str, List[str]] = defaultdict(list)
+    for (kind, key), value in entries.items():
+        if value is _DELETE:
+            deleted[kind].append(key)
+        else:
+            rows.append(BotState(kind=kind, key=key, data=pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+
+    with transaction.atomic():
+        if rows:
+            BotState.objects.bulk_create(
+                rows,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=['kind', 'key'],
+                update_fields=['data', 'updated_at'],
+            )
+        for kind, keys in deleted.items():
+            BotState.objects.filter(kind=kind, key__in=keys).delete()
+
+
+class DjangoPersistence(BasePersistence):
+    """
+    BasePersistence backed by the BotState table.
+
+    update_*/drop_* only record the latest value per key; a background task writes
+    everything recorded during one persistence run as a single batch. flush() (called
+    by PTB on shutdown) waits for that task and writes whatever is left.
+    """
+
+    def __init__(self, update_interval: Optional[float] = None) -> None:
+        super().__init__(
+            store_data=STORE_DATA,
+            update_interval=update_interval or getattr(settings, 'BOT_PERSISTENCE_INTERVAL', 30),
+        )
+        self._loaded: Optional[Dict[str, Dict[str, Any]]] = None
+        self._pending: Dict[StateKey, Any] = {}
+        self._writer: Optional[asyncio.Task] = None
+
+    async def _states(self, kind: str) -> Dict[str, Any]:
+        if self._loaded is None:
+            self._loaded = await _load_states()
+        # Each kind is read once on startup; the Application keeps it in memory afterwards
+        return self._loaded.pop(kind, {})
+
+    def _record(self, kind: str, key: str, value: Any) -> None:
+        self._pending[(kind, key)] = value
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_pending())
+
+    async def _write_pending(self) -> None:
+        # Let the rest of the current persistence run record its updates first
+        await asyncio.sleep(0)
+        while self._pending:
+            batch, self._pending = self._pending, {}
+            try:
+                await _write_states(batch)
+            except Exception:
+                logger.exception("Failed to persist %s bot state entries", len(batch))
+                # Keep the entries for the next run unless a newer value was recorded meanwhile
+                for key, value in batch.items():
+                    self._pending.setdefault(key, value)
+                return
+            logger.debug("Persisted %s bot state entries", len(batch))
+
+    # ========== Loading (once, on Application.initialize) ==========
+
+    async def get_user_data(self) -> Dict[int, Dict[Any, Any]]:
+        return {int(key): data for key, data in (await self._states(BotState.KIND_USER)).items()}
+
+    async def get_chat_data(self) -> Dict[int, Dict[Any, Any]]:
+        return {}
+
+    async def get_bot_data(self) -> Dict[Any, Any]:
+        return {}
+
+    async def get_callback_data(self) -> None:
+        return None
+
+    async def get_conversations(self, name: str) -> Dict[Tuple[int, ...], object]:
+        states = await self._states(_conversation_kind(name))
+        return {tuple(json.loads(key)): state for key, state in states.items()}
+
+    # ========== Updates (coalesced, written in batches) ==========
+
+    async def update_user_data(self, user_id: int, data: Dict[Any, Any]) -> None:
+        self._record(BotState.KIND_USER, str(user_id), data)
+
+    async def drop_user_data(self, user_id: int) -> None:
+        self._record(BotState.KIND_USER, str(user_id), _DELETE)
+
+    async def update_conversation(self, name: str, key: Tuple[int, ...], new_state: Optional[object]) -> None:
+        # None means the conversation ended: its row is removed
+        value = _DELETE if new_state is None else new_state
+        self._record(_conversation_kind(name), _conversation_key(key), value)
+
+    async def update_chat_data(self, chat_id: int, data: Dict[Any, Any]) -> None:
+        pass
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        pass
+
+    async def update_bot_data(self, data: Dict[Any, Any]) -> None:
+        pass
+
+    async def update_callback_data(self, data: Any) -> None:
+        pass
+
+    # The in-memory copy is authoritative while the bot runs: no DB reads per update
+    async def refresh_user_data(self, user_id: int, user_data: Dict[Any, Any]) -> None:
+        pass
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: Dict[Any, Any]) -> None:
+        pass
+
+    async def refresh_bot_data(self, bot_data: Dict[Any, Any]) -> None:
+        pass
+
+    async def flush(self) -> None:
+        if self._writer is not None:
+            await self._writer
+        if self._pending:
+            batch, self._pending = self._pending, {}
+            await _write_states(batch)
+
+
+class FilePersistence(PicklePersistence):
+    """
+    PicklePersistence for local development that rewrites the file once per
+    persistence run instead of once per changed key.
+    """
+
+    def __init__(self, filepath: str, update_interval: Optional[float] = None) -> None:
+        super().__init__(
+            filepath,
+            store_data=STORE_DATA,
+            update_interval=update_interval or getattr(settings, 'BOT_PERSISTENCE_INTERVAL', 30),
+            on_flush=True,
+        )
+        self._dump_scheduled = False
+
+    def _schedule_dump(self) -> None:
+        if not self._dump_scheduled:
+            self._dump_scheduled = True
+            asyncio.get_running_loop().call_soon(self._dump)
+
+    def _dump(self) -> None:
+        self._dump_scheduled = False
+        self._dump_singlefile()
+
+    async def update_user_data(self, user_id: int, data: Dict[Any, Any]) -> None:
+        await super().update_user_data(user_id, data)
+        self._schedule_dump()
+
+    async def drop_user_data(self, user_id: int) -> None:
+        await super().drop_user_data(user_id)
+        self._schedule_dump()
+
+    async def update_conversation(self, name: str, key: Tuple[int, ...], new_state: Optional[object]) -> None:
+        await super().update_conversation(name, key, new_state)
+        self._schedule_dump()
+
+
+def build_persistence() -> Optional[BasePersistence]:
+    """Persistence selected by BOT_PERSISTENCE ('db', 'file' or empty to disable)."""
+    backend = getattr(settings, 'BOT_PERSISTENCE', 'db')
+    if backend == 'db':
+        return DjangoPersistence()
+    if backend == 'file':
+        return FilePersistence(getattr(settings, 'BOT_PERSISTENCE_FILE', 'bot_state.pickle'))
+    if backend:
+        raise ValueError(f"Unknown BOT_PERSISTENCE backend: {backend!r}")
+    return None
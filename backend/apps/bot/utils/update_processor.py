@@ -0,0 +1,157 @@
+"""
+Concurrent update processing with per-chat ordering.
+
+Updates from different chats run in parallel (up to BOT_CONCURRENT_UPDATES at once);
+updates from one chat run strictly one after another, in arrival order, so
+ConversationHandler state is never read and written by two updates of the same chat.
+
+The per-chat lock is taken before a global slot: queued updates of one busy chat wait
+without occupying slots other chats could use. PTB's own semaphore only bounds the
+number of updates in flight (BOT_UPDATE_MAX_PENDING: running plus waiting).
+"""
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Awaitable, Deque, Dict, Optional
+
+from django.conf import settings
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+# Recent waits kept for percentiles
+WAIT_SAMPLE_SIZE = 1000
+
+
+class UpdateStats:
+    """Queue depth and wait-time counters of the update processor."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.waiting = 0
+        self.running = 0
+        self.max_waiting = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._recent_waits: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+
+    def record_queued(self) -> None:
+        with self._lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def record_started(self, waited: float) -> None:
+        with self._lock:
+            self.waiting -= 1
+            self.running += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            self._recent_waits.append(waited)
+
+    def record_dropped(self) -> None:
+        """A queued update was cancelled (shutdown) before it started."""
+        with self._lock:
+            self.waiting -= 1
+
+    def record_finished(self) -> None:
+        with self._lock:
+            self.running -= 1
+            self.processed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._recent_waits)
+            started = self.processed + self.running
+            return {
+                'processed': self.processed,
+                'running': self.running,
+                'waiting': self.waiting,
+                'max_waiting': self.max_waiting,
+                'wait_avg_ms': round(self.wait_total / started * 1000, 2) if started else None,
+                'wait_p95_ms': round(recent[int(len(recent) * 0.95) - 1] * 1000, 2) if recent else None,
+                'wait_max_ms': round(self.wait_max * 1000, 2),
+            }
+
+
+@dataclass(slots=True)
+class _ChatQueue:
+    """Lock of one chat and the number of its updates holding or waiting for it."""
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0
+
+
+def _chat_key(update: object) -> Optional[int]:
+    """Ordering key: the chat of the update, or the user for updates without a chat."""
+    if not isinstance(update, Update):
+        return None
+    if update.effective_chat is not None:
+        return update.effective_chat.id
+    if update.effective_user is not None:
+        return update.effective_user.id
+    return None
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """BaseUpdateProcessor with a global concurrency cap and strict per-chat ordering."""
+
+    def __init__(self, concurrency: Optional[int] = None, max_pending: Optional[int] = None) -> None:
+        self.concurrency = max(1, concurrency or getattr(settings, 'BOT_CONCURRENT_UPDATES', 16))
+        max_pending = max_pending or getattr(settings, 'BOT_UPDATE_MAX_PENDING', 1000)
+        # max_concurrent_updates > 1 makes the Application dispatch every update as its own task
+        super().__init__(max(max_pending, self.concurrency, 2))
+        self.stats = UpdateStats()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._chats: Dict[int, _ChatQueue] = {}
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        key = _chat_key(update)
+        queued_at = monotonic()
+        self.stats.record_queued()
+        if key is None:
+            await self._run(coroutine, queued_at)
+            return
+
+        chat = self._chats.get(key)
+        if chat is None:
+            chat = self._chats[key] = _ChatQueue()
+        chat.users += 1
+        try:
+            # asyncio.Lock is FIFO: updates of one chat start in arrival order
+            try:
+                await chat.lock.acquire()
+            except asyncio.CancelledError:
+                self.stats.record_dropped()
+                if asyncio.iscoroutine(coroutine):
+                    coroutine.close()
+                raise
+            try:
+                await self._run(coroutine, queued_at)
+            finally:
+                chat.lock.release()
+        finally:
+            chat.users -= 1
+            if not chat.users:
+                del self._chats[key]
+
+    async def _run(self, coroutine: Awaitable[Any], queued_at: float) -> None:
+        try:
+            await self._slots.acquire()
+        except asyncio.CancelledError:
+            self.stats.record_dropped()
+            if asyncio.iscoroutine(coroutine):
+                coroutine.close()
+            raise
+        self.stats.record_started(monotonic() - queued_at)
+        try:
+            await coroutine
+        finally:
+            self._slots.release()
+            self.stats.record_finished()
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
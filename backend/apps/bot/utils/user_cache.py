@@ -0,0 +1,67 @@
+"""
+Conversation-scoped User cache: the user is read once per session and kept in
+context.user_data. Updates made by the bot write through to the cached instance
+and save only the changed fields, so they never overwrite edits made elsewhere.
+
+Edits from the admin/API bump the user's version in the Django cache. The bot sees
+the bump at once only with a cache shared between processes (CACHE_BACKEND, Redis in
+docker-compose); with the default per-process LocMemCache a cached user is re-read
+after USER_SESSION_CACHE_TTL at the latest.
+"""
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+
+from apps.users.cache import aget_version, user_version_key
+from apps.users.models import User
+
+from .db import DatabaseService
+
+SESSION_KEY = 'cached_user'
+
+
+@dataclass(slots=True)
+class SessionUser:
+    """User cached in user_data with the version it was read at."""
+    user: User
+    version: int
+    cached_at: float
+
+
+async def remember_session_user(context, user: User) -> User:
+    """Store `user` in the conversation cache (after reading or writing it)."""
+    version = await aget_version(user_version_key(user.id))
+    context.user_data[SESSION_KEY] = SessionUser(user, version, time.time())
+    return user
+
+
+def forget_session_user(context) -> None:
+    context.user_data.pop(SESSION_KEY, None)
+
+
+async def get_session_user(context, telegram_id: Optional[str] = None) -> User:
+    """
+    The current user from the conversation cache, re-read from the DB if it is missing,
+    belongs to another telegram_id, expired (USER_SESSION_CACHE_TTL) or was edited elsewhere.
+    Raises User.DoesNotExist like DatabaseService.get_user_by_telegram_id.
+    """
+    telegram_id = telegram_id or context.user_data.get('telegram_id')
+    entry: Optional[SessionUser] = context.user_data.get(SESSION_KEY)
+    if (
+        entry is not None
+        and entry.user.telegram_id == telegram_id
+        and time.time() - entry.cached_at < getattr(settings, 'USER_SESSION_CACHE_TTL', 300)
+        and entry.version == await aget_version(user_version_key(entry.user.id))
+    ):
+        return entry.user
+
+    user = await DatabaseService.get_user_by_telegram_id(telegram_id)
+    return await remember_session_user(context, user)
+
+
+async def update_session_user(context, user: User, **fields) -> User:
+    """Write-through update: saves the fields and keeps the cached user current."""
+    user = await DatabaseService.update_user_fields(user, **fields)
+    return await remember_session_user(context, user)
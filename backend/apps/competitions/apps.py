@@ -4,3 +4,6 @@ class CompetitionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.competitions'
     verbose_name = 'Соревнования'
+
+    def ready(self):
+        from . import signals  # noqa: F401
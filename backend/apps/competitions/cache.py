@@ -0,0 +1,124 @@
+"""
+Процессный кеш соревнований для бота: список соревнований с названием и флагами
+entry_open_* меняется редко, а читается на каждом шаге регистрации. Хранятся компактные
+снимки CompetitionSnapshot (id, название, открытые роли), а не модели.
+
+Кеш read-through с TTL и версией: версия (VERSION_KEY) хранится в Django cache и
+увеличивается сигналами post_save/post_delete Competition в процессе, где идёт правка
+(API, админка). Бот — отдельный процесс и видит её сразу только при общем CACHE_BACKEND
+(в docker-compose — Redis, как и для версий пользователей); с LocMemCache по умолчанию
+правка дойдёт до бота не позже чем через COMPETITION_CACHE_TTL секунд.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from apps.users.cache import get_version
+
+from .models import Competition
+
+VERSION_KEY = 'competitions:version'
+
+SNAPSHOT_FIELDS = (
+    'id', 'name', 'entry_open_player', 'entry_open_voter', 'entry_open_viewer', 'entry_open_adviser',
+)
+
+ROLES = ('player', 'voter', 'viewer', 'adviser')
+
+
+@dataclass(slots=True)
+class CompetitionSnapshot:
+    """
+    Снимок соревнования для бота: id, название и роли с открытой регистрацией,
+    вычисленные один раз. Хранится в context.user_data на время диалога регистрации.
+    """
+    id: int
+    name: str
+    open_roles: Tuple[str, ...]
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]) -> 'CompetitionSnapshot':
+        return cls(
+            id=values['id'],
+            name=values['name'],
+            open_roles=tuple(role for role in ROLES if values[f'entry_open_{role}']),
+        )
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class CompetitionCache:
+    """Снимки всех соревнований, загружаемые одним запросом .values(), со счётчиками hit/miss."""
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items: Optional[List[CompetitionSnapshot]] = None
+        self._by_id: Dict[int, CompetitionSnapshot] = {}
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _ttl(self) -> float:
+        return self.ttl if self.ttl is not None else getattr(settings, 'COMPETITION_CACHE_TTL', 60)
+
+    def _is_fresh(self, version: int) -> bool:
+        return (
+            self._items is not None
+            and self._version == version
+            and time.monotonic() - self._loaded_at < self._ttl()
+        )
+
+    def _load(self) -> Tuple[List[CompetitionSnapshot], Dict[int, CompetitionSnapshot]]:
+        """
+        Актуальные снимки (список и словарь по id), взятые под блокировкой: invalidate()
+        из другого потока не может обнулить их между проверкой и чтением.
+        """
+        version = get_version(VERSION_KEY)
+        with self._lock:
+            if self._is_fresh(version):
+                self.hits += 1
+                return self._items, self._by_id
+            self.misses += 1
+            items = [
+                CompetitionSnapshot.from_values(values)
+                for values in Competition.objects.order_by('id').values(*SNAPSHOT_FIELDS)
+            ]
+            self._items = items
+            self._by_id = {item.id: item for item in items}
+            self._version = version
+            self._loaded_at = time.monotonic()
+            return self._items, self._by_id
+
+    def all(self) -> List[CompetitionSnapshot]:
+        items, _ = self._load()
+        return list(items)
+
+    def get(self, comp_id: int) -> CompetitionSnapshot:
+        """Соревнование по id; Competition.DoesNotExist, если его нет."""
+        _, by_id = self._load()
+        try:
+            return by_id[int(comp_id)]
+        except (KeyError, TypeError, ValueError):
+            raise Competition.DoesNotExist(f"Competition {comp_id} does not exist")
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._items = None
+            self._by_id = {}
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 3) if total else None,
+        }
+
+
+competition_cache = CompetitionCache()
@@ -0,0 +1,66 @@
+"""
+Conditional GET для list/retrieve: ETag считается одним агрегатом по тем же строкам,
+что попадут в ответ (COUNT и MAX(updated_at) своих и связанных записей), и при совпадении
+с If-None-Match отдаётся 304 Not Modified — без выборки строк, prefetch и сериализации.
+
+COUNT ловит удаления, MAX(updated_at) — изменения и вставки. Участники соревнований
+меняют Competition.updated_at (сигнал m2m_changed или Competition.touch).
+"""
+import hashlib
+from typing import Optional, Sequence
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.db.models.query import EmptyQuerySet
+from django.utils.cache import get_conditional_response
+
+
+class ConditionalGetMixin:
+    """Для ModelViewSet: ETag и 304 для действий из conditional_actions."""
+
+    conditional_actions: Sequence[str] = ('list', 'retrieve')
+    # Поля, чьи MAX входят в ETag: updated_at модели и связанных объектов, попадающих в ответ
+    etag_fields: Sequence[str] = ('updated_at',)
+
+    def get_etag(self, request) -> Optional[str]:
+        # get_queryset() без токена отдаёт none(): такие ответы не кешируются
+        if isinstance(self.get_queryset(), EmptyQuerySet):
+            return None
+        # Базовый queryset без аннотаций и prefetch: агрегат не должен их вычислять
+        queryset = self.filter_queryset(self.queryset.all()).order_by()
+        try:
+            if self.action == 'retrieve':
+                lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+                queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            state = queryset.aggregate(
+                count=Count('pk'),
+                **{f'max_{i}': Max(field) for i, field in enumerate(self.etag_fields)},
+            )
+        except (ValueError, TypeError, ValidationError):
+            return None  # некорректный pk (/abc/): 404 отдаст обычный retrieve
+        if self.action == 'retrieve' and not state['count']:
+            return None  # 404 отдаст обычный retrieve
+        raw = '|'.join([
+            repr(sorted(state.items())),
+            request.get_full_path(),
+            request.accepted_media_type or '',
+        ])
+        return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+    def _conditional(self, request, handler, *args, **kwargs):
+        etag = self.get_etag(request) if self.action in self.conditional_actions else None
+        if etag is not None:
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified['ETag'] = etag
+                return not_modified
+        response = handler(request, *args, **kwargs)
+        if etag is not None and response.status_code == 200:
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(request, super().retrieve, *args, **kwargs)
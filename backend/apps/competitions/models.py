@@ -1,9 +1,20 @@
+from typing import Iterable
+
 from django.db import models
+from django.utils import timezone
 
 from apps.users.models import User
 
 
 class Competition(models.Model):
+    # Роль участника -> M2M-поле со списком участников в этой роли
+    ROLE_FIELDS = {
+        'player': 'arbitrators',
+        'voter': 'voters',
+        'viewer': 'viewers',
+        'adviser': 'advisers',
+    }
+
     name = models.CharField(max_length=255, verbose_name='Название')
     description = models.TextField(null=True, blank=True, verbose_name='Описание')
     entry_open_player = models.BooleanField(default=True, verbose_name='Открыта регистрация (Игроки)')
@@ -17,6 +28,8 @@ class Competition(models.Model):
     advisers = models.ManyToManyField(User, related_name='competitions_as_adviser', blank=True, verbose_name='Секунданты')
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создано')
+    # Меняется и при изменении участников (см. touch): по нему API считает ETag
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Обновлено')
 
     class Meta:
         db_table = 'competitions_competition'
@@ -26,6 +39,14 @@ class Competition(models.Model):
     def __str__(self) -> str:
         return self.name
 
+    @classmethod
+    def touch(cls, ids: Iterable[int]) -> None:
+        """
+        Обновляет updated_at соревнований. Нужен там, где участники меняются мимо
+        m2m_changed: bulk_create/delete по through-таблицам.
+        """
+        cls.objects.filter(id__in=ids).update(updated_at=timezone.now())
+
 
 class VoterTimeSlot(models.Model):
     """
@@ -52,6 +73,7 @@ class VoterTimeSlot(models.Model):
     end_time = models.TimeField(verbose_name='Время окончания')
     
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создано')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Обновлено')
     
     class Meta:
         db_table = 'competitions_votertimeslot'
@@ -0,0 +1,21 @@
+"""
+Курсорная пагинация API соревнований: стабильные страницы без COUNT(*) и без OFFSET,
+новые записи не сдвигают уже выданные страницы.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class CompetitionCursorPagination(CursorPagination):
+    """Список соревнований: сначала новые."""
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class ParticipantCursorPagination(CursorPagination):
+    """Участники соревнования по возрастанию id пользователя."""
+    ordering = 'id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
@@ -0,0 +1,19 @@
+"""
+Querysets API соревнований с отображаемыми полями, вычисленными в SQL
+(см. apps.users.querysets).
+"""
+from django.db.models import F
+
+from apps.users.querysets import full_name
+
+from .models import VoterTimeSlot
+
+
+def voter_time_slots(queryset=None):
+    """Слоты с voter_display и competition_display для VoterTimeSlotSerializer."""
+    if queryset is None:
+        queryset = VoterTimeSlot.objects.all()
+    return queryset.annotate(
+        voter_display=full_name('voter'),
+        competition_display=F('competition__name'),
+    )
@@ -1,16 +1,54 @@
+from typing import List
+
 from rest_framework import serializers
+from apps.users.models import User
+from apps.users.querysets import AnnotationField
 from .models import Competition, VoterTimeSlot
 
 class CompetitionSerializer(serializers.ModelSerializer):
+    """Полное соревнование со списками id участников (retrieve, create, update)"""
     class Meta:
         model = Competition
         fields = '__all__'
 
 
+class CompetitionListSerializer(serializers.ModelSerializer):
+    """
+    Соревнование в списке: вместо списков участников — их число по ролям
+    (аннотации <поле>_count, см. CompetitionViewSet.get_queryset).
+    """
+    arbitrators_count = serializers.IntegerField(read_only=True)
+    voters_count = serializers.IntegerField(read_only=True)
+    viewers_count = serializers.IntegerField(read_only=True)
+    advisers_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Competition
+        fields = [
+            'id', 'name', 'description',
+            'entry_open_player', 'entry_open_voter', 'entry_open_viewer', 'entry_open_adviser',
+            'arbitrators_count', 'voters_count', 'viewers_count', 'advisers_count',
+            'created_at', 'updated_at',
+        ]
+
+
+class ParticipantSerializer(serializers.ModelSerializer):
+    """Участник соревнования и его роли в этом соревновании"""
+    roles = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ['id', 'chat_id', 'first_name', 'last_name', 'username', 'email', 'phone', 'roles']
+
+    def get_roles(self, obj) -> List[str]:
+        return self.context.get('roles', {}).get(obj.id, [])
+
+
 class VoterTimeSlotSerializer(serializers.ModelSerializer):
     """Сериализатор для временных слотов судей"""
-    voter_display = serializers.SerializerMethodField()
-    competition_display = serializers.SerializerMethodField()
+    # Аннотации из apps.competitions.querysets.voter_time_slots
+    voter_display = AnnotationField()
+    competition_display = AnnotationField()
     
     class Meta:
         model = VoterTimeSlot
@@ -19,9 +57,3 @@ class VoterTimeSlotSerializer(serializers.ModelSerializer):
             'slot_date', 'start_time', 'end_time', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
-    
-    def get_voter_display(self, obj):
-        return f"{obj.voter.first_name} {obj.voter.last_name}"
-    
-    def get_competition_display(self, obj):
-        return obj.competition.name
@@ -0,0 +1,50 @@
+"""
+Инвалидация кеша соревнований бота при изменении соревнования (админка, API)
+и updated_at соревнования при изменении его участников через M2M-менеджеры
+и при удалении пользователя-участника.
+"""
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.users.cache import bump_version
+from apps.users.models import User
+
+from .cache import VERSION_KEY, competition_cache
+from .models import Competition
+
+
+@receiver(post_save, sender=Competition, dispatch_uid='competition_cache_post_save')
+@receiver(post_delete, sender=Competition, dispatch_uid='competition_cache_post_delete')
+def invalidate_competition_cache(sender, **kwargs):
+    competition_cache.invalidate()
+    bump_version(VERSION_KEY)
+
+
+def touch_competition_members(sender, instance, action, reverse, pk_set, **kwargs):
+    """add/remove/clear участников меняют ответы API соревнований: сдвигаем updated_at (ETag)."""
+    if reverse:
+        # instance — пользователь, pk_set — соревнования; для clear они известны только до удаления
+        if action == 'pre_clear':
+            Competition.touch(sender.objects.filter(user_id=instance.pk).values('competition_id'))
+        elif action in ('post_add', 'post_remove') and pk_set:
+            Competition.touch(pk_set)
+    elif action == 'post_clear' or (action in ('post_add', 'post_remove') and pk_set):
+        Competition.touch([instance.pk])
+
+
+for _field in Competition.ROLE_FIELDS.values():
+    m2m_changed.connect(
+        touch_competition_members,
+        sender=getattr(Competition, _field).through,
+        dispatch_uid=f'competition_touch_{_field}',
+    )
+
+
+@receiver(pre_delete, sender=User, dispatch_uid='competition_touch_user_delete')
+def touch_competitions_of_deleted_user(sender, instance, **kwargs):
+    """Удаление пользователя каскадно удаляет его строки through-таблиц без m2m_changed."""
+    member = Q()
+    for field in Competition.ROLE_FIELDS.values():
+        member |= Q(**{field: instance.pk})
+    Competition.touch(Competition.objects.filter(member).values('id'))
@@ -0,0 +1,38 @@
+import pytest
+
+from apps.competitions.cache import CompetitionCache
+from apps.competitions.models import Competition
+
+
+@pytest.mark.django_db
+def test_invalidate_between_load_and_read(monkeypatch):
+    competition = Competition.objects.create(name='Кубок', entry_open_voter=False)
+    cache = CompetitionCache(ttl=60)
+    load = cache._load
+
+    def load_then_invalidate():
+        # invalidate() из другого потока сразу после проверки свежести
+        result = load()
+        cache.invalidate()
+        return result
+
+    monkeypatch.setattr(cache, '_load', load_then_invalidate)
+
+    assert [snapshot.id for snapshot in cache.all()] == [competition.id]
+    snapshot = cache.get(competition.id)
+    assert snapshot.name == 'Кубок'
+    assert 'voter' not in snapshot.open_roles
+
+
+@pytest.mark.django_db
+def test_admin_edit_reaches_cache_of_another_process():
+    """Бот — другой процесс: его кеш узнаёт о правке только по версии в общем Django cache."""
+    competition = Competition.objects.create(name='Кубок', entry_open_voter=True)
+    bot_cache = CompetitionCache(ttl=60)
+    assert 'voter' in bot_cache.get(competition.id).open_roles
+
+    # Правка в админке: сигнал сбрасывает только кеш своего процесса и версию
+    competition.entry_open_voter = False
+    competition.save()
+
+    assert 'voter' not in bot_cache.get(competition.id).open_roles
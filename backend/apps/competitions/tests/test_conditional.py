@@ -0,0 +1,36 @@
+import pytest
+
+from apps.competitions.models import Competition
+from apps.users.models import User
+
+
+@pytest.mark.django_db
+def test_unchanged_list_returns_304(admin_client):
+    Competition.objects.create(name='Кубок')
+    etag = admin_client.get('/api/competitions/')['ETag']
+
+    response = admin_client.get('/api/competitions/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url', ['/api/competitions/abc/', '/api/voter-time-slots/abc/'])
+def test_malformed_pk_returns_404(admin_client, url):
+    assert admin_client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_deleting_member_changes_list_etag(admin_client):
+    competition = Competition.objects.create(name='Кубок')
+    user = User.objects.create(chat_id='1', first_name='Иван')
+    competition.voters.add(user)
+    etag = admin_client.get('/api/competitions/')['ETag']
+
+    # Каскадное удаление строк through-таблицы не шлёт m2m_changed
+    user.delete()
+    response = admin_client.get('/api/competitions/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response.json()['results'][0]['voters_count'] == 0
@@ -0,0 +1,82 @@
+import datetime
+
+import pytest
+
+from apps.competitions.models import Competition, VoterTimeSlot
+from apps.users.models import User
+
+
+def _slots(count):
+    competition = Competition.objects.create(name='Кубок')
+    voters = User.objects.bulk_create([
+        User(chat_id=f'v{i}', first_name=f'Судья{i}', last_name=f'Фамилия{i}', role='voter')
+        for i in range(count)
+    ])
+    return VoterTimeSlot.objects.bulk_create([
+        VoterTimeSlot(
+            competition=competition, voter=voter, slot_date=datetime.date(2026, 1, 1),
+            start_time=datetime.time(10), end_time=datetime.time(11),
+        )
+        for voter in voters
+    ])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('count', [3, 30])
+def test_voter_time_slot_list_query_count(admin_client, django_assert_num_queries, count):
+    _slots(count)
+
+    # Агрегат для ETag и один запрос с аннотациями, без запросов на строку
+    with django_assert_num_queries(2):
+        response = admin_client.get('/api/voter-time-slots/')
+
+    assert response.status_code == 200
+    assert len(response.json()) == count
+
+
+@pytest.mark.django_db
+def test_voter_time_slot_display_fields_match_related_objects(admin_client):
+    _slots(3)
+
+    rows = admin_client.get('/api/voter-time-slots/').json()
+
+    for row in rows:
+        slot = VoterTimeSlot.objects.get(id=row['id'])
+        # Значения прежних SerializerMethodField
+        assert row['voter_display'] == f"{slot.voter.first_name} {slot.voter.last_name}"
+        assert row['competition_display'] == slot.competition.name
+
+
+@pytest.mark.django_db
+def test_voter_time_slot_retrieve_query_count(admin_client, django_assert_num_queries):
+    slot, = _slots(1)
+
+    # Агрегат для ETag и слот с аннотациями
+    with django_assert_num_queries(2):
+        response = admin_client.get(f'/api/voter-time-slots/{slot.id}/')
+
+    assert response.status_code == 200
+    assert response.json()['voter_display'] == 'Судья0 Фамилия0'
+
+
+@pytest.mark.django_db
+def test_voter_time_slot_create_and_update_query_count(admin_client, django_assert_num_queries):
+    slot, = _slots(1)
+    payload = {
+        'competition': slot.competition_id, 'voter': slot.voter_id,
+        'slot_date': '2026-01-02', 'start_time': '10:00', 'end_time': '11:00',
+    }
+
+    # Проверка competition/voter, уникальности, INSERT и перечитывание с аннотациями (_reload)
+    with django_assert_num_queries(5):
+        response = admin_client.post('/api/voter-time-slots/', payload, format='json')
+    assert response.status_code == 201
+    assert response.json()['competition_display'] == 'Кубок'
+
+    # Объект, проверка competition/voter, уникальности, UPDATE и _reload
+    with django_assert_num_queries(6):
+        response = admin_client.patch(
+            f"/api/voter-time-slots/{response.json()['id']}/", {'start_time': '09:00'}, format='json',
+        )
+    assert response.status_code == 200
+    assert response.json()['voter_display'] == 'Судья0 Фамилия0'
@@ -2,30 +2,82 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.conf import settings
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from apps.users.models import User
+from apps.users.querysets import AnnotatedQuerysetMixin
+from .conditional import ConditionalGetMixin
 from .models import Competition, VoterTimeSlot
-from .serializers import CompetitionSerializer, VoterTimeSlotSerializer
+from .pagination import CompetitionCursorPagination, ParticipantCursorPagination
+from .querysets import voter_time_slots
+from .serializers import (
+    CompetitionSerializer,
+    CompetitionListSerializer,
+    ParticipantSerializer,
+    VoterTimeSlotSerializer,
+)
 
-class CompetitionViewSet(viewsets.ModelViewSet):
+
+def _members(field):
+    """Строки through-таблицы M2M-поля соревнования (competition_id, user_id)."""
+    return Competition._meta.get_field(field).remote_field.through.objects
+
+
+def _member_count(field):
+    """Число участников в роли: подзапрос COUNT(DISTINCT user_id) по through-таблице."""
+    counts = (
+        _members(field)
+        .filter(competition_id=OuterRef('pk'))
+        .order_by()
+        .values('competition_id')
+        .annotate(n=Count('user_id', distinct=True))
+        .values('n')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class CompetitionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     API endpoints для управления соревнованиями.
     
     Требует заголовок X-Admin-Token для доступа.
     
-    list: Получить список всех соревнований
+    list: Получить список соревнований (курсорная пагинация, число участников по ролям)
+    list и retrieve отдают ETag и 304 Not Modified на If-None-Match
     create: Создать новое соревнование
-    retrieve: Получить детали конкретного соревнования
+    retrieve: Получить детали конкретного соревнования (со списками участников)
+    participants: Участники соревнования постранично (?role=player|voter|viewer|adviser)
     update: Обновить соревнование
     partial_update: Частичное обновление соревнования
     destroy: Удалить соревнование
     """
     queryset = Competition.objects.all()
     serializer_class = CompetitionSerializer
+    pagination_class = CompetitionCursorPagination
 
     def get_queryset(self):
         token = self.request.headers.get('X-Admin-Token', '')
         if token != settings.ADMIN_TOKEN:
             return Competition.objects.none()
-        return Competition.objects.all().prefetch_related('arbitrators', 'voters', 'viewers', 'advisers')
+        fields = Competition.ROLE_FIELDS.values()
+        if self.action == 'list':
+            # Списки участников в списке соревнований не отдаются — только их число
+            return Competition.objects.annotate(
+                **{f'{field}_count': _member_count(field) for field in fields}
+            )
+        if self.action == 'participants':
+            return Competition.objects.all()
+        # Для списков id участников достаточно первичных ключей
+        return Competition.objects.prefetch_related(
+            *(Prefetch(field, queryset=User.objects.only('id')) for field in fields)
+        )
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return CompetitionListSerializer
+        if self.action == 'participants':
+            return ParticipantSerializer
+        return CompetitionSerializer
 
     def list(self, request, *args, **kwargs):
         token = request.headers.get('X-Admin-Token', '')
@@ -39,8 +91,44 @@ class CompetitionViewSet(viewsets.ModelViewSet):
             return Response({'error': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
         return super().create(request, *args, **kwargs)
 
+    @action(detail=True, methods=['get'], pagination_class=ParticipantCursorPagination)
+    def participants(self, request, pk=None):
+        """Участники соревнования постранично, с ролями в этом соревновании"""
+        token = request.headers.get('X-Admin-Token', '')
+        if token != settings.ADMIN_TOKEN:
+            return Response({'error': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        competition = self.get_object()
+        role_fields = Competition.ROLE_FIELDS
+        role = request.query_params.get('role')
+        if role:
+            if role not in role_fields:
+                return Response(
+                    {'error': f"role must be one of: {', '.join(role_fields)}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            role_fields = {role: role_fields[role]}
+
+        in_competition = Q()
+        for field in role_fields.values():
+            in_competition |= Q(id__in=_members(field).filter(competition_id=competition.id).values('user_id'))
+        page = self.paginate_queryset(User.objects.filter(in_competition))
+
+        # Роли только для пользователей текущей страницы: по запросу на роль
+        user_ids = [user.id for user in page]
+        roles = {}
+        for role_name, field in role_fields.items():
+            member_ids = _members(field).filter(
+                competition_id=competition.id, user_id__in=user_ids,
+            ).values_list('user_id', flat=True)
+            for user_id in member_ids:
+                roles.setdefault(user_id, []).append(role_name)
+
+        serializer = self.get_serializer(page, many=True, context={**self.get_serializer_context(), 'roles': roles})
+        return self.get_paginated_response(serializer.data)
+
 
-class VoterTimeSlotViewSet(viewsets.ModelViewSet):
+class VoterTimeSlotViewSet(ConditionalGetMixin, AnnotatedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoints для управления временными слотами судей в соревнованиях.
     
@@ -53,9 +141,13 @@ class VoterTimeSlotViewSet(viewsets.ModelViewSet):
     update: Обновить слот
     partial_update: Частичное обновление слота
     destroy: Удалить слот
+    list и retrieve отдают ETag и 304 Not Modified на If-None-Match
     """
     queryset = VoterTimeSlot.objects.all()
     serializer_class = VoterTimeSlotSerializer
+    display_queryset = staticmethod(voter_time_slots)
+    # В ответе есть имя судьи и название соревнования
+    etag_fields = ('updated_at', 'competition__updated_at', 'voter__updated_at')
     filterset_fields = ['competition', 'voter', 'slot_date']
     ordering_fields = ['slot_date', 'start_time']
     ordering = ['slot_date', 'start_time']
@@ -64,7 +156,7 @@ class VoterTimeSlotViewSet(viewsets.ModelViewSet):
         token = self.request.headers.get('X-Admin-Token', '')
         if token != settings.ADMIN_TOKEN:
             return VoterTimeSlot.objects.none()
-        return VoterTimeSlot.objects.select_related('competition', 'voter')
+        return voter_time_slots()
 
     def update(self, request, *args, **kwargs):
         token = request.headers.get('X-Admin-Token', '')
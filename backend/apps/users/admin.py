@@ -1,5 +1,9 @@
 from django.contrib import admin
-from .models import User, ProfileChangeLog, NotificationOutbox, RegistrationRequest
+from .models import (
+    User, ProfileChangeLog, NotificationOutbox, NotificationOutboxArchive, RegistrationRequest, Broadcast,
+    OutboxTemplate,
+)
+from .registration import ACTION_APPROVE, ACTION_REJECT, review_registration_requests
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
@@ -73,9 +77,48 @@ class ProfileChangeLogAdmin(admin.ModelAdmin):
 
 @admin.register(NotificationOutbox)
 class NotificationOutboxAdmin(admin.ModelAdmin):
-    list_display = ('id', 'status', 'chat_id', 'user', 'attempts', 'created_at', 'sent_at')
-    list_filter = ('status', 'created_at', 'sent_at')
-    search_fields = ('chat_id', 'user__username', 'user__first_name', 'user__last_name')
+    list_display = (
+        'id', 'status', 'channel', 'chat_id', 'email', 'user', 'attempts',
+        'next_attempt_at', 'claimed_by', 'created_at', 'sent_at',
+    )
+    list_filter = ('status', 'channel', 'created_at', 'sent_at')
+    search_fields = ('chat_id', 'email', 'user__username', 'user__first_name', 'user__last_name')
+    raw_id_fields = ('user', 'broadcast', 'template')
+
+
+@admin.register(NotificationOutboxArchive)
+class NotificationOutboxArchiveAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'channel', 'chat_id', 'email', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status', 'channel')
+    search_fields = ('chat_id', 'email')
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(OutboxTemplate)
+class OutboxTemplateAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'content_hash', 'created_at')
+    search_fields = ('subject', 'body', 'content_hash')
+    readonly_fields = ('content_hash', 'subject', 'body', 'created_at')
+
+
+@admin.register(Broadcast)
+class BroadcastAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'status', 'role', 'total_recipients', 'processed_recipients',
+        'tg_enqueued', 'email_enqueued', 'created_at', 'finished_at',
+    )
+    list_filter = ('status', 'role', 'created_at')
+    search_fields = ('message', 'subject')
+    readonly_fields = (
+        'status', 'template', 'total_recipients', 'processed_recipients', 'last_user_id', 'tg_enqueued',
+        'email_enqueued', 'created_at', 'started_at', 'finished_at',
+    )
 
 
 @admin.register(RegistrationRequest)
@@ -107,24 +150,17 @@ class RegistrationRequestAdmin(admin.ModelAdmin):
     
     actions = ['approve_requests', 'reject_requests']
     
+    # Как и API: статус, участие в соревновании по роли и уведомления — одной транзакцией.
+    # reviewed_by ссылается на пользователя бота, поэтому администратор Django там не пишется.
+
     def approve_requests(self, request, queryset):
         """Одобрить заявки"""
-        from django.utils import timezone
-        updated = queryset.filter(status=RegistrationRequest.STATUS_PENDING).update(
-            status=RegistrationRequest.STATUS_APPROVED,
-            reviewed_at=timezone.now(),
-            reviewed_by=request.user
-        )
-        self.message_user(request, f"✓ Одобрено {updated} заявок")
+        result = review_registration_requests(queryset.values_list('id', flat=True), ACTION_APPROVE)
+        self.message_user(request, f"✓ Одобрено {len(result['updated'])} заявок")
     approve_requests.short_description = "✓ Одобрить заявки"
     
     def reject_requests(self, request, queryset):
         """Отклонить заявки"""
-        from django.utils import timezone
-        updated = queryset.filter(status=RegistrationRequest.STATUS_PENDING).update(
-            status=RegistrationRequest.STATUS_REJECTED,
-            reviewed_at=timezone.now(),
-            reviewed_by=request.user
-        )
-        self.message_user(request, f"✗ Отклонено {updated} заявок")
+        result = review_registration_requests(queryset.values_list('id', flat=True), ACTION_REJECT)
+        self.message_user(request, f"✗ Отклонено {len(result['updated'])} заявок")
     reject_requests.short_description = "✗ Отклонить заявки"
@@ -4,3 +4,7 @@ class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.users'
     verbose_name = 'Пользователи'
+
+    def ready(self):
+        from . import db_stats, signals  # noqa: F401
+        db_stats.install()
@@ -0,0 +1,27 @@
+"""
+Версии в Django cache для инвалидации процессных кешей бота: при изменении записи
+(сигналы, админка) версия увеличивается, и закешированная копия считается устаревшей.
+При общем бэкенде кеша (CACHE_BACKEND) изменение видно во всех процессах сразу.
+"""
+from django.core.cache import cache
+
+
+def get_version(key: str) -> int:
+    return cache.get(key) or 0
+
+
+async def aget_version(key: str) -> int:
+    return await cache.aget(key) or 0
+
+
+def bump_version(key: str) -> None:
+    """Увеличивает версию (создаёт её, если ключа ещё нет)."""
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def user_version_key(user_id: int) -> str:
+    return f'users:version:{user_id}'
@@ -0,0 +1,84 @@
+"""
+Счётчики соединений с БД в процессе (API или бот): сколько соединений открыто,
+сколько единиц работы (запрос API, вызов DatabaseService) переиспользовали уже открытое
+соединение и сколько бот ждал свободного потока пула. По ним подбираются CONN_MAX_AGE,
+BOT_DB_THREADS и размер пула pgbouncer.
+"""
+import os
+import threading
+from typing import Any, Dict
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+class ConnectionStats:
+    """Потокобезопасные счётчики соединений одного процесса."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.checkouts = 0
+        self.reused = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_opened(self) -> None:
+        with self._lock:
+            self.opened += 1
+
+    def record_checkout(self, reused: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            if reused:
+                self.reused += 1
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        db = settings.DATABASES['default']
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'opened': self.opened,
+                'checkouts': self.checkouts,
+                'reused': self.reused,
+                'reuse_ratio': round(self.reused / self.checkouts, 3) if self.checkouts else None,
+                'pool_waits': self.waits,
+                'pool_wait_avg_ms': round(self.wait_total / self.waits * 1000, 2) if self.waits else None,
+                'pool_wait_max_ms': round(self.wait_max * 1000, 2),
+                'conn_max_age': db.get('CONN_MAX_AGE', 0),
+                'conn_health_checks': db.get('CONN_HEALTH_CHECKS', False),
+                'pgbouncer': db.get('DISABLE_SERVER_SIDE_CURSORS', False),
+                'bot_db_threads': getattr(settings, 'BOT_DB_THREADS', 10),
+            }
+
+
+connection_stats = ConnectionStats()
+
+
+def is_connected(alias: str = 'default') -> bool:
+    """True, если у текущего потока уже есть открытое соединение."""
+    return connections[alias].connection is not None
+
+
+def _on_connection_created(sender, connection, **kwargs) -> None:
+    connection_stats.record_opened()
+
+
+def _on_request_started(sender, **kwargs) -> None:
+    # Срабатывает после close_old_connections Django: живое соединение будет переиспользовано
+    connection_stats.record_checkout(reused=is_connected())
+
+
+def install() -> None:
+    """Подключает счётчики к сигналам Django (вызывается из AppConfig.ready)."""
+    connection_created.connect(_on_connection_created, dispatch_uid='db_stats_connection_created')
+    request_started.connect(_on_request_started, dispatch_uid='db_stats_request_started')
@@ -0,0 +1,24 @@
+"""
+Перенос старых отправленных/неудачных строк outbox в архив пачками.
+
+    python manage.py archive_outbox --days 30 --batch-size 1000
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.users.outbox_retention import archive_outbox
+
+
+class Command(BaseCommand):
+    help = 'Переносит sent/failed строки outbox старше N дней в архив ограниченными пачками'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'OUTBOX_RETENTION_DAYS', 30))
+        parser.add_argument(
+            '--batch-size', type=int, default=getattr(settings, 'OUTBOX_RETENTION_BATCH_SIZE', 1000),
+        )
+        parser.add_argument('--max-batches', type=int, default=None, help='Ограничить число пачек за запуск')
+
+    def handle(self, *args, **options):
+        moved = archive_outbox(options['days'], options['batch_size'], options['max_batches'])
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} outbox rows"))
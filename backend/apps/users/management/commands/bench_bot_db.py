@@ -0,0 +1,97 @@
+"""
+Бенчмарк доступа бота к БД: N одновременных пользователей проходят типичный сценарий
+обработчиков (/start, список соревнований, выбор соревнования и роли).
+
+    python manage.py bench_bot_db --users 500
+    python manage.py bench_bot_db --users 500 --mode legacy   # один поток + close_old_connections
+"""
+import asyncio
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+
+def _legacy(method):
+    """Старая обёртка: единый thread-sensitive поток и close_old_connections до и после вызова."""
+    func = method.sync
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(wrapper)
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Бенчмарк DatabaseService под нагрузкой N одновременных пользователей бота'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--rounds', type=int, default=3, help='Сценариев на пользователя')
+        parser.add_argument('--think-ms', type=float, default=20.0, help='Пауза между шагами (ответ Telegram)')
+        parser.add_argument('--mode', choices=['pool', 'legacy'], default='pool')
+        parser.add_argument('--keep', action='store_true', help='Не удалять созданных пользователей')
+
+    def handle(self, *args, **options):
+        from apps.users.models import User
+
+        try:
+            asyncio.run(self._run(options))
+        finally:
+            if not options['keep']:
+                User.objects.filter(chat_id__startswith='bench-').delete()
+
+    async def _run(self, options):
+        from apps.bot.utils.db import DatabaseService
+
+        names = [
+            'get_or_create_user', 'get_user_by_telegram_id', 'get_open_competitions_for_role',
+            'get_competitions', 'get_open_roles_for_competition',
+        ]
+        if options['mode'] == 'legacy':
+            db = {name: _legacy(getattr(DatabaseService, name)) for name in names}
+        else:
+            db = {name: getattr(DatabaseService, name) for name in names}
+        think = options['think_ms'] / 1000
+        latencies = []
+
+        async def step(coro):
+            started = time.monotonic()
+            result = await coro
+            latencies.append(time.monotonic() - started)
+            await asyncio.sleep(think)
+            return result
+
+        async def simulate_user(n):
+            chat_id = f'bench-{n}'
+            for _ in range(options['rounds']):
+                await step(db['get_or_create_user'](chat_id, chat_id, f'user{n}', 'Bench', str(n)))
+                await step(db['get_user_by_telegram_id'](chat_id))
+                competitions = await step(db['get_open_competitions_for_role']('player'))
+                all_competitions = await step(db['get_competitions']())
+                competition = (competitions or all_competitions or [None])[0]
+                if competition is not None:
+                    await step(db['get_open_roles_for_competition'](competition))
+
+        started = time.monotonic()
+        await asyncio.gather(*(simulate_user(n) for n in range(options['users'])))
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(
+            f"mode={options['mode']} users={options['users']} calls={len(latencies)} "
+            f"elapsed={elapsed:.2f}s throughput={len(latencies) / elapsed:.1f} calls/s "
+            f"p50={_percentile(latencies, 50) * 1000:.1f}ms "
+            f"p99={_percentile(latencies, 99) * 1000:.1f}ms"
+        )
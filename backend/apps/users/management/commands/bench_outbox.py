@@ -0,0 +1,79 @@
+"""
+Бенчмарк отправки outbox против фейкового Telegram Bot (без сети и БД).
+
+    python manage.py bench_outbox --messages 600 --latency-ms 80
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+
+class FakeBot:
+    """Имитирует Bot.send_message: фиксированная задержка сети, запоминает время отправки."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.sent_at = {}
+
+    async def send_message(self, chat_id, text):
+        await asyncio.sleep(self.latency)
+        self.sent_at[text] = time.monotonic()
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Бенчмарк OutboxSender против фейкового Bot: msgs/sec и p99 задержки enqueue→send'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=600)
+        parser.add_argument('--chats', type=int, default=0, help='Число разных чатов (0 = по чату на сообщение)')
+        parser.add_argument('--latency-ms', type=float, default=80.0)
+        parser.add_argument('--concurrency', type=int, default=30)
+        parser.add_argument('--rate', type=float, default=30.0, help='Глобальный лимит, сообщений/сек')
+        parser.add_argument('--per-chat-rate', type=float, default=1.0)
+        parser.add_argument('--sequential', action='store_true', help='Старый режим: по одному сообщению')
+
+    def handle(self, *args, **options):
+        asyncio.run(self._run(options))
+
+    async def _run(self, options):
+        from apps.bot.utils.outbox import OutboxSender
+
+        count = options['messages']
+        chats = options['chats'] or count
+        bot = FakeBot(options['latency_ms'] / 1000)
+
+        items = [
+            SimpleNamespace(id=i, chat_id=str(i % chats), message=str(i), attempts=0)
+            for i in range(count)
+        ]
+        enqueued_at = time.monotonic()
+
+        if options['sequential']:
+            for item in items:
+                await bot.send_message(chat_id=item.chat_id, text=item.message)
+        else:
+            sender = OutboxSender(
+                bot,
+                concurrency=options['concurrency'],
+                global_rate=options['rate'],
+                per_chat_rate=options['per_chat_rate'],
+            )
+            await sender.send_many(items)
+
+        elapsed = time.monotonic() - enqueued_at
+        latencies = [sent - enqueued_at for sent in bot.sent_at.values()]
+        self.stdout.write(
+            f"mode={'sequential' if options['sequential'] else 'concurrent'} "
+            f"messages={len(latencies)} elapsed={elapsed:.2f}s "
+            f"throughput={len(latencies) / elapsed:.1f} msg/s "
+            f"p50={_percentile(latencies, 50) * 1000:.0f}ms "
+            f"p99={_percentile(latencies, 99) * 1000:.0f}ms"
+        )
@@ -0,0 +1,84 @@
+"""
+Отправка записанных обновлений Telegram в webhook бота (локальная проверка runbot --mode webhook).
+
+    python manage.py replay_updates updates.json
+    python manage.py replay_updates updates.jsonl --url http://localhost:8443/telegram --repeat 10
+
+Файл — JSON-объект обновления, список обновлений или JSON Lines (по обновлению в строке).
+"""
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _load_updates(path):
+    with open(path, encoding='utf-8') as f:
+        text = f.read().strip()
+    if not text:
+        return []
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return data if isinstance(data, list) else [data]
+
+
+class Command(BaseCommand):
+    help = 'POST записанных обновлений Telegram в webhook бота'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSON / JSON Lines с обновлениями')
+        parser.add_argument(
+            '--url', default=f"http://localhost:{settings.BOT_WEBHOOK_PORT}/{settings.BOT_WEBHOOK_PATH}",
+        )
+        parser.add_argument('--repeat', type=int, default=1, help='Сколько раз отправить файл целиком')
+        parser.add_argument(
+            '--secret', default=None,
+            help='Секрет webhook (по умолчанию BOT_WEBHOOK_SECRET или производный от TELEGRAM_TOKEN)',
+        )
+
+    def handle(self, *args, **options):
+        updates = _load_updates(options['path'])
+        if not updates:
+            raise CommandError('No updates in file')
+
+        secret = options['secret']
+        if secret is None:
+            token = os.environ.get('TELEGRAM_TOKEN')
+            if not token and not settings.BOT_WEBHOOK_SECRET:
+                raise CommandError('Pass --secret or set TELEGRAM_TOKEN / BOT_WEBHOOK_SECRET')
+            from apps.bot import webhook_secret
+            secret = webhook_secret(token or '')
+
+        sent = failed = 0
+        started = time.monotonic()
+        for _ in range(options['repeat']):
+            for update in updates:
+                request = urllib.request.Request(
+                    options['url'],
+                    data=json.dumps(update).encode(),
+                    headers={
+                        'Content-Type': 'application/json',
+                        'X-Telegram-Bot-Api-Secret-Token': secret,
+                    },
+                    method='POST',
+                )
+                try:
+                    with urllib.request.urlopen(request, timeout=10):
+                        sent += 1
+                except urllib.error.HTTPError as exc:
+                    failed += 1
+                    self.stderr.write(f"update_id={update.get('update_id')}: HTTP {exc.code}")
+                except urllib.error.URLError as exc:
+                    raise CommandError(f"Webhook {options['url']} is not reachable: {exc.reason}")
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(
+            f"sent={sent} failed={failed} elapsed={elapsed:.2f}s "
+            f"rate={(sent + failed) / elapsed:.1f} updates/s"
+        )
@@ -0,0 +1,74 @@
+"""
+Запуск Telegram-бота: long polling или webhook (встроенный асинхронный HTTP-сервер PTB).
+
+    python manage.py runbot                                   # polling
+    python manage.py runbot --mode webhook --webhook-url https://bot.example.com/telegram
+    python manage.py runbot --mode webhook --concurrent-updates 16 --max-connections 80
+
+В режиме webhook адрес (--webhook-url или BOT_WEBHOOK_URL) обязателен: PTB при запуске
+всегда вызывает setWebhook, а Telegram принимает только публичный https-адрес.
+Локальная проверка webhook: запустите бота с тестовым токеном и туннелем (ngrok и т.п.)
+в --webhook-url, затем отправьте записанные обновления командой replay_updates.
+"""
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Запускает Telegram-бота в режиме polling или webhook'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=['polling', 'webhook'], default=settings.BOT_MODE)
+        parser.add_argument(
+            '--concurrent-updates', type=int, default=settings.BOT_CONCURRENT_UPDATES,
+            help='Сколько обновлений обрабатывать одновременно (по чату — всегда по очереди)',
+        )
+        parser.add_argument('--listen', default=settings.BOT_WEBHOOK_LISTEN)
+        parser.add_argument('--port', type=int, default=settings.BOT_WEBHOOK_PORT)
+        parser.add_argument('--url-path', default=settings.BOT_WEBHOOK_PATH)
+        parser.add_argument(
+            '--webhook-url', default=settings.BOT_WEBHOOK_URL,
+            help='Публичный https-адрес webhook, регистрируется в Telegram (обязателен для --mode webhook)',
+        )
+        parser.add_argument(
+            '--max-connections', type=int, default=settings.BOT_WEBHOOK_MAX_CONNECTIONS,
+            help='Одновременных соединений Telegram с webhook (1-100)',
+        )
+        parser.add_argument('--drop-pending-updates', action='store_true')
+
+    def handle(self, *args, **options):
+        from apps.bot import build_application, webhook_secret
+
+        token = os.environ.get('TELEGRAM_TOKEN')
+        if not token:
+            raise CommandError('TELEGRAM_TOKEN not set')
+        if not 1 <= options['max_connections'] <= 100:
+            raise CommandError('--max-connections must be between 1 and 100')
+        if options['mode'] == 'webhook' and not options['webhook_url'].startswith('https://'):
+            raise CommandError('Webhook mode needs a public https:// --webhook-url (or BOT_WEBHOOK_URL)')
+
+        app = build_application(token, concurrent_updates=options['concurrent_updates'])
+        drop_pending = options['drop_pending_updates'] or None
+
+        if options['mode'] == 'polling':
+            self.stdout.write(f"Bot starting (polling, concurrent_updates={options['concurrent_updates']})...")
+            app.run_polling(drop_pending_updates=drop_pending)
+            return
+
+        url_path = options['url_path'].strip('/')
+        self.stdout.write(
+            f"Bot starting (webhook on {options['listen']}:{options['port']}/{url_path}, "
+            f"max_connections={options['max_connections']}, "
+            f"concurrent_updates={options['concurrent_updates']})..."
+        )
+        app.run_webhook(
+            listen=options['listen'],
+            port=options['port'],
+            url_path=url_path,
+            webhook_url=options['webhook_url'],
+            secret_token=webhook_secret(token),
+            max_connections=options['max_connections'],
+            drop_pending_updates=drop_pending,
+        )
@@ -0,0 +1,43 @@
+# Триггер NOTIFY на вставку в outbox (только PostgreSQL)
+
+from django.db import migrations
+
+CREATE_SQL = """
+CREATE OR REPLACE FUNCTION users_notificationoutbox_notify() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('notification_outbox', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_notificationoutbox_notify ON users_notificationoutbox;
+CREATE TRIGGER users_notificationoutbox_notify
+    AFTER INSERT ON users_notificationoutbox
+    FOR EACH STATEMENT EXECUTE FUNCTION users_notificationoutbox_notify();
+"""
+
+DROP_SQL = """
+DROP TRIGGER IF EXISTS users_notificationoutbox_notify ON users_notificationoutbox;
+DROP FUNCTION IF EXISTS users_notificationoutbox_notify();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_SQL)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_notificationoutbox_lease'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
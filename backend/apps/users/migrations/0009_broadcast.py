@@ -0,0 +1,67 @@
+# Generated by Django 4.2 on 2026-10-18 05:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Новая рассылка будит бота тем же NOTIFY, что и строки outbox (функция из 0008)
+CREATE_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS users_broadcast_notify ON users_broadcast;
+CREATE TRIGGER users_broadcast_notify
+    AFTER INSERT ON users_broadcast
+    FOR EACH STATEMENT EXECUTE FUNCTION users_notificationoutbox_notify();
+"""
+
+DROP_TRIGGER_SQL = "DROP TRIGGER IF EXISTS users_broadcast_notify ON users_broadcast;"
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRIGGER_SQL)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_notificationoutbox_notify_trigger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Broadcast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message', models.TextField(verbose_name='Сообщение')),
+                ('subject', models.CharField(blank=True, default='', max_length=255, verbose_name='Тема письма')),
+                ('role', models.CharField(blank=True, choices=[('player', 'Игрок'), ('voter', 'Судья'), ('viewer', 'Зритель'), ('adviser', 'Секундант'), ('admin', 'Администратор')], max_length=20, null=True, verbose_name='Роль получателей')),
+                ('channels', models.JSONField(blank=True, default=list, verbose_name='Каналы')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('expanding', 'Разворачивается'), ('done', 'Поставлена в очередь'), ('failed', 'Ошибка')], db_index=True, default='pending', max_length=16, verbose_name='Статус')),
+                ('total_recipients', models.PositiveIntegerField(blank=True, null=True, verbose_name='Всего получателей')),
+                ('processed_recipients', models.PositiveIntegerField(default=0, verbose_name='Обработано получателей')),
+                ('last_user_id', models.BigIntegerField(default=0, verbose_name='Курсор (последний user id)')),
+                ('tg_enqueued', models.PositiveIntegerField(default=0, verbose_name='Telegram в очереди')),
+                ('email_sent', models.PositiveIntegerField(default=0, verbose_name='Email отправлено')),
+                ('email_failed', models.PositiveIntegerField(default=0, verbose_name='Email с ошибкой')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Примеры ошибок')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Начало')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Развёрнута')),
+            ],
+            options={
+                'verbose_name': 'Рассылка',
+                'verbose_name_plural': 'Рассылки',
+                'db_table': 'users_broadcast',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='broadcast',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='outbox_items', to='users.broadcast', verbose_name='Рассылка'),
+        ),
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
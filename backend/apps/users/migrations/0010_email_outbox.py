@@ -0,0 +1,50 @@
+# Generated by Django 4.2 on 2026-10-18 05:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_broadcast'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='broadcast',
+            name='email_failed',
+        ),
+        migrations.RemoveField(
+            model_name='broadcast',
+            name='email_sent',
+        ),
+        migrations.RemoveField(
+            model_name='broadcast',
+            name='errors',
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='email_enqueued',
+            field=models.PositiveIntegerField(default=0, verbose_name='Email в очереди'),
+        ),
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='channel',
+            field=models.CharField(choices=[('tg', 'Telegram'), ('email', 'Email')], default='tg', max_length=16, verbose_name='Канал'),
+        ),
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='email',
+            field=models.EmailField(blank=True, max_length=254, null=True, verbose_name='Email получателя'),
+        ),
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='subject',
+            field=models.CharField(blank=True, default='', max_length=255, verbose_name='Тема письма'),
+        ),
+        migrations.AlterField(
+            model_name='notificationoutbox',
+            name='chat_id',
+            field=models.CharField(blank=True, default='', max_length=255, verbose_name='ID чата (Telegram)'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-18 05:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_email_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True, verbose_name='Хеш содержимого')),
+                ('subject', models.CharField(blank=True, default='', max_length=255, verbose_name='Тема письма')),
+                ('body', models.TextField(verbose_name='Текст')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+            ],
+            options={
+                'verbose_name': 'Шаблон рассылки',
+                'verbose_name_plural': 'Шаблоны рассылок',
+                'db_table': 'users_outboxtemplate',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='notificationoutbox',
+            name='message',
+            field=models.TextField(blank=True, default='', verbose_name='Сообщение'),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='broadcasts', to='users.outboxtemplate', verbose_name='Шаблон'),
+        ),
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='outbox_items', to='users.outboxtemplate', verbose_name='Шаблон'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2 on 2026-10-18 05:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_outbox_template'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutboxArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID строки outbox')),
+                ('user_id', models.BigIntegerField(blank=True, null=True, verbose_name='ID пользователя')),
+                ('broadcast_id', models.BigIntegerField(blank=True, db_index=True, null=True, verbose_name='ID рассылки')),
+                ('channel', models.CharField(choices=[('tg', 'Telegram'), ('email', 'Email')], max_length=16, verbose_name='Канал')),
+                ('chat_id', models.CharField(blank=True, default='', max_length=255, verbose_name='ID чата (Telegram)')),
+                ('email', models.EmailField(blank=True, max_length=254, null=True, verbose_name='Email получателя')),
+                ('subject', models.CharField(blank=True, default='', max_length=255, verbose_name='Тема письма')),
+                ('message', models.TextField(blank=True, default='', verbose_name='Сообщение')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], max_length=16, verbose_name='Статус')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Попыток')),
+                ('last_error', models.TextField(blank=True, null=True, verbose_name='Последняя ошибка')),
+                ('created_at', models.DateTimeField(verbose_name='Создано')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Отправлено')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Архивировано')),
+            ],
+            options={
+                'verbose_name': 'Архив outbox',
+                'verbose_name_plural': 'Архив outbox',
+                'db_table': 'users_notificationoutbox_archive',
+                'ordering': ['-id'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='notificationoutbox',
+            name='users_notif_status_9d7f7b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notificationoutbox',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['channel', 'created_at'], name='users_outbox_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationoutbox',
+            index=models.Index(condition=models.Q(('status', 'sending')), fields=['lease_until'], name='users_outbox_sending_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationoutboxarchive',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_outbox_items', to='users.outboxtemplate', verbose_name='Шаблон'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_outbox_archive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='telegram_id',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True, verbose_name='Telegram ID'),
+        ),
+    ]
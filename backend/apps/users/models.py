@@ -13,7 +13,7 @@ ROLE_CHOICES = [
 
 class User(models.Model):
     chat_id = models.CharField(max_length=255, unique=True, verbose_name='ID чата')
-    telegram_id = models.CharField(max_length=255, null=True, blank=True, verbose_name='Telegram ID')
+    telegram_id = models.CharField(max_length=255, null=True, blank=True, db_index=True, verbose_name='Telegram ID')
     first_name = models.CharField(max_length=255, null=True, blank=True, verbose_name='Имя')
     last_name = models.CharField(max_length=255, null=True, blank=True, verbose_name='Фамилия')
     username = models.CharField(max_length=255, null=True, blank=True, verbose_name='Telegram username')
@@ -42,6 +42,10 @@ class User(models.Model):
 
     class Meta:
         db_table = 'users_user'
+        indexes = [
+            # Keyset-пагинация и выгрузка /api/users/
+            models.Index(fields=['created_at', 'id'], name='users_user_created_id_idx'),
+        ]
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
 
@@ -67,21 +71,117 @@ class ProfileChangeLog(models.Model):
         return f"{self.user.username} - {self.field_name} - {self.changed_at}"
 
 
+class OutboxTemplate(models.Model):
+    """
+    Текст рассылки, хранимый один раз: строки outbox ссылаются на шаблон по FK,
+    а не копируют текст. Плейсхолдеры вида {first_name} подставляются при отправке.
+    """
+
+    content_hash = models.CharField(max_length=64, unique=True, verbose_name='Хеш содержимого')
+    subject = models.CharField(max_length=255, blank=True, default='', verbose_name='Тема письма')
+    body = models.TextField(verbose_name='Текст')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создано')
+
+    class Meta:
+        db_table = 'users_outboxtemplate'
+        ordering = ['-created_at']
+        verbose_name = 'Шаблон рассылки'
+        verbose_name_plural = 'Шаблоны рассылок'
+
+    def __str__(self) -> str:
+        return f"Template#{self.id} {self.content_hash[:12]}"
+
+
+class Broadcast(models.Model):
+    """
+    Задача массовой рассылки: API создаёт её и сразу отвечает 202,
+    процесс бота разворачивает получателей в outbox пачками (курсор last_user_id).
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_EXPANDING = 'expanding'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Ожидает'),
+        (STATUS_EXPANDING, 'Разворачивается'),
+        (STATUS_DONE, 'Поставлена в очередь'),
+        (STATUS_FAILED, 'Ошибка'),
+    ]
+
+    message = models.TextField(verbose_name='Сообщение')
+    subject = models.CharField(max_length=255, blank=True, default='', verbose_name='Тема письма')
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, null=True, blank=True, verbose_name='Роль получателей')
+    channels = models.JSONField(default=list, blank=True, verbose_name='Каналы')
+    template = models.ForeignKey(
+        OutboxTemplate,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='broadcasts',
+        verbose_name='Шаблон',
+    )
+
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        db_index=True,
+        verbose_name='Статус',
+    )
+    total_recipients = models.PositiveIntegerField(null=True, blank=True, verbose_name='Всего получателей')
+    processed_recipients = models.PositiveIntegerField(default=0, verbose_name='Обработано получателей')
+    last_user_id = models.BigIntegerField(default=0, verbose_name='Курсор (последний user id)')
+    tg_enqueued = models.PositiveIntegerField(default=0, verbose_name='Telegram в очереди')
+    email_enqueued = models.PositiveIntegerField(default=0, verbose_name='Email в очереди')
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создано')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Начало')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Развёрнута')
+
+    class Meta:
+        db_table = 'users_broadcast'
+        ordering = ['-created_at']
+        verbose_name = 'Рассылка'
+        verbose_name_plural = 'Рассылки'
+
+    def __str__(self) -> str:
+        return f"Broadcast#{self.id} {self.status}"
+
+    def recipients(self):
+        """Получатели рассылки (фильтр по роли, если задан)."""
+        users = User.objects.all()
+        if self.role:
+            users = users.filter(role=self.role)
+        return users
+
+
 class NotificationOutbox(models.Model):
     """
     Outbox для рассылок: API складывает задачи, bot отправляет и помечает статусы.
     """
 
     STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
     STATUS_SENT = 'sent'
     STATUS_FAILED = 'failed'
 
     STATUS_CHOICES = [
         (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
         (STATUS_SENT, 'Sent'),
         (STATUS_FAILED, 'Failed'),
     ]
 
+    CHANNEL_TG = 'tg'
+    CHANNEL_EMAIL = 'email'
+
+    CHANNEL_CHOICES = [
+        (CHANNEL_TG, 'Telegram'),
+        (CHANNEL_EMAIL, 'Email'),
+    ]
+
     user = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -90,8 +190,33 @@ class NotificationOutbox(models.Model):
         related_name='notification_outbox',
         verbose_name='Пользователь',
     )
-    chat_id = models.CharField(max_length=255, verbose_name='ID чата (Telegram)')
-    message = models.TextField(verbose_name='Сообщение')
+    broadcast = models.ForeignKey(
+        Broadcast,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='outbox_items',
+        verbose_name='Рассылка',
+    )
+    channel = models.CharField(
+        max_length=16,
+        choices=CHANNEL_CHOICES,
+        default=CHANNEL_TG,
+        verbose_name='Канал',
+    )
+    chat_id = models.CharField(max_length=255, blank=True, default='', verbose_name='ID чата (Telegram)')
+    email = models.EmailField(null=True, blank=True, verbose_name='Email получателя')
+    template = models.ForeignKey(
+        OutboxTemplate,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='outbox_items',
+        verbose_name='Шаблон',
+    )
+    # Для строк с шаблоном subject/message пустые: текст рендерится при отправке
+    subject = models.CharField(max_length=255, blank=True, default='', verbose_name='Тема письма')
+    message = models.TextField(blank=True, default='', verbose_name='Сообщение')
 
     status = models.CharField(
         max_length=16,
@@ -102,6 +227,11 @@ class NotificationOutbox(models.Model):
     )
     attempts = models.PositiveIntegerField(default=0, verbose_name='Попыток')
     last_error = models.TextField(null=True, blank=True, verbose_name='Последняя ошибка')
+    next_attempt_at = models.DateTimeField(null=True, blank=True, verbose_name='Следующая попытка')
+
+    # Аренда строки воркером бота (status=sending): после lease_until строку можно забрать снова
+    claimed_by = models.CharField(max_length=255, null=True, blank=True, verbose_name='Захвачено воркером')
+    lease_until = models.DateTimeField(null=True, blank=True, verbose_name='Аренда до')
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создано')
     sent_at = models.DateTimeField(null=True, blank=True, verbose_name='Отправлено')
@@ -109,16 +239,97 @@ class NotificationOutbox(models.Model):
     class Meta:
         db_table = 'users_notificationoutbox'
         ordering = ['-created_at']
+        # Отправленные/неудачные строки уезжают в архив (archive_outbox), поэтому
+        # горячий путь работает с частичными индексами только по живым строкам
         indexes = [
-            models.Index(fields=['status', 'created_at']),
+            models.Index(
+                fields=['channel', 'created_at'],
+                name='users_outbox_pending_idx',
+                condition=models.Q(status='pending'),
+            ),
+            models.Index(
+                fields=['lease_until'],
+                name='users_outbox_sending_idx',
+                condition=models.Q(status='sending'),
+            ),
         ]
         verbose_name = 'Outbox уведомлений'
         verbose_name_plural = 'Outbox уведомлений'
 
     def __str__(self) -> str:
+        if self.channel == self.CHANNEL_EMAIL:
+            return f"Outbox#{self.id} {self.status} email={self.email}"
         return f"Outbox#{self.id} {self.status} chat_id={self.chat_id}"
 
 
+class NotificationOutboxArchive(models.Model):
+    """
+    Архив отправленных и окончательно неудачных строк outbox старше OUTBOX_RETENTION_DAYS.
+    id совпадает с id исходной строки; ссылки на пользователя и рассылку хранятся
+    без внешних ключей, чтобы архив не мешал удалению и не тормозил запись.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name='ID строки outbox')
+    user_id = models.BigIntegerField(null=True, blank=True, verbose_name='ID пользователя')
+    broadcast_id = models.BigIntegerField(null=True, blank=True, db_index=True, verbose_name='ID рассылки')
+    template = models.ForeignKey(
+        OutboxTemplate,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='archived_outbox_items',
+        verbose_name='Шаблон',
+    )
+    channel = models.CharField(max_length=16, choices=NotificationOutbox.CHANNEL_CHOICES, verbose_name='Канал')
+    chat_id = models.CharField(max_length=255, blank=True, default='', verbose_name='ID чата (Telegram)')
+    email = models.EmailField(null=True, blank=True, verbose_name='Email получателя')
+    subject = models.CharField(max_length=255, blank=True, default='', verbose_name='Тема письма')
+    message = models.TextField(blank=True, default='', verbose_name='Сообщение')
+    status = models.CharField(max_length=16, choices=NotificationOutbox.STATUS_CHOICES, verbose_name='Статус')
+    attempts = models.PositiveIntegerField(default=0, verbose_name='Попыток')
+    last_error = models.TextField(null=True, blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(verbose_name='Создано')
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name='Отправлено')
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name='Архивировано')
+
+    class Meta:
+        db_table = 'users_notificationoutbox_archive'
+        ordering = ['-id']
+        verbose_name = 'Архив outbox'
+        verbose_name_plural = 'Архив outbox'
+
+    def __str__(self) -> str:
+        return f"OutboxArchive#{self.id} {self.status}"
+
+
+class BotState(models.Model):
+    """
+    Состояние бота между перезапусками: context.user_data и состояния диалогов
+    ConversationHandler. Значение хранится в pickle; пишется пачками раз
+    в BOT_PERSISTENCE_INTERVAL секунд и при остановке бота.
+    """
+
+    KIND_USER = 'user'
+    # Для диалогов kind = 'conversation:<имя ConversationHandler>'
+    KIND_CONVERSATION_PREFIX = 'conversation:'
+
+    kind = models.CharField(max_length=64, verbose_name='Тип')
+    key = models.CharField(max_length=255, verbose_name='Ключ')
+    data = models.BinaryField(verbose_name='Данные (pickle)')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Обновлено')
+
+    class Meta:
+        db_table = 'users_botstate'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'key'], name='users_botstate_kind_key_uniq'),
+        ]
+        verbose_name = 'Состояние бота'
+        verbose_name_plural = 'Состояния бота'
+
+    def __str__(self) -> str:
+        return f"BotState {self.kind}:{self.key}"
+
+
 class RegistrationRequest(models.Model):
     """
     Заявка на регистрацию участника в соревновании.
@@ -0,0 +1,184 @@
+"""
+Массовые рассылки: API создаёт Broadcast, процесс бота разворачивает получателей
+в outbox (Telegram и email) пачками (курсор по user id), прогресс считается по строкам outbox.
+Текст рассылки хранится один раз в OutboxTemplate, строки outbox ссылаются на него.
+"""
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from .models import Broadcast, NotificationOutbox, NotificationOutboxArchive
+from .outbox_notify import notify_outbox
+from .outbox_templates import get_or_create_template
+
+
+def create_broadcast(
+    message: str,
+    subject: str,
+    role: Optional[str] = None,
+    channels: Optional[List[str]] = None,
+) -> Broadcast:
+    """
+    Создаёт задачу рассылки и будит бота после коммита.
+    `message` и `subject` могут содержать плейсхолдеры получателя ({first_name} и т.п.).
+    """
+    broadcast = Broadcast.objects.create(
+        message=message,
+        subject=subject,
+        role=role or None,
+        channels=channels or [],
+        template=get_or_create_template(subject, message),
+    )
+    transaction.on_commit(notify_outbox)
+    return broadcast
+
+
+def expand_next_broadcast_chunk(chunk_size: Optional[int] = None) -> bool:
+    """
+    Разворачивает очередную пачку получателей одной незавершённой рассылки.
+    Строка рассылки блокируется (SKIP LOCKED), пачка outbox и курсор коммитятся вместе,
+    поэтому несколько воркеров не дублируют строки, а упавший продолжит с курсора.
+
+    Возвращает False, если разворачивать нечего.
+    """
+    chunk_size = chunk_size or getattr(settings, 'NOTIFY_CHUNK_SIZE', 1000)
+
+    with transaction.atomic():
+        broadcast = (
+            Broadcast.objects
+            .select_for_update(skip_locked=True)
+            .filter(status__in=[Broadcast.STATUS_PENDING, Broadcast.STATUS_EXPANDING])
+            .order_by('created_at')
+            .first()
+        )
+        if broadcast is None:
+            return False
+
+        now = timezone.now()
+        if broadcast.status == Broadcast.STATUS_PENDING:
+            broadcast.status = Broadcast.STATUS_EXPANDING
+            broadcast.started_at = now
+            broadcast.total_recipients = broadcast.recipients().count()
+        if broadcast.template_id is None:
+            broadcast.template = get_or_create_template(broadcast.subject, broadcast.message)
+
+        channels = broadcast.channels or []
+        send_tg = not channels or 'tg' in channels
+        send_email = not channels or 'email' in channels
+
+        recipients = list(
+            broadcast.recipients()
+            .filter(id__gt=broadcast.last_user_id)
+            .order_by('id')
+            .values_list('id', 'chat_id', 'email')[:chunk_size]
+        )
+
+        rows = []
+        for user_id, chat_id, email in recipients:
+            if send_tg:
+                rows.append(NotificationOutbox(
+                    broadcast=broadcast,
+                    user_id=user_id,
+                    channel=NotificationOutbox.CHANNEL_TG,
+                    chat_id=chat_id,
+                    template_id=broadcast.template_id,
+                ))
+                broadcast.tg_enqueued += 1
+            # Письма тоже идут через outbox: их шлёт процесс бота пачками по одному SMTP-соединению
+            if send_email and email:
+                rows.append(NotificationOutbox(
+                    broadcast=broadcast,
+                    user_id=user_id,
+                    channel=NotificationOutbox.CHANNEL_EMAIL,
+                    email=email,
+                    template_id=broadcast.template_id,
+                ))
+                broadcast.email_enqueued += 1
+        if rows:
+            NotificationOutbox.objects.bulk_create(rows)
+
+        if recipients:
+            broadcast.last_user_id = recipients[-1][0]
+            broadcast.processed_recipients += len(recipients)
+        if len(recipients) < chunk_size:
+            broadcast.status = Broadcast.STATUS_DONE
+            broadcast.finished_at = now
+        broadcast.save()
+
+    if rows:
+        notify_outbox()
+    return True
+
+
+def _delivery_stats(items) -> Dict[str, Any]:
+    is_tg = Q(channel=NotificationOutbox.CHANNEL_TG)
+    is_email = Q(channel=NotificationOutbox.CHANNEL_EMAIL)
+    is_sent = Q(status=NotificationOutbox.STATUS_SENT)
+    is_failed = Q(status=NotificationOutbox.STATUS_FAILED)
+    return items.aggregate(
+        sent=Count('id', filter=is_tg & is_sent),
+        failed=Count('id', filter=is_tg & is_failed),
+        email_sent=Count('id', filter=is_email & is_sent),
+        email_failed=Count('id', filter=is_email & is_failed),
+        first_sent_at=Min('sent_at', filter=is_tg),
+        last_sent_at=Max('sent_at', filter=is_tg),
+    )
+
+
+def broadcast_progress(broadcast: Broadcast) -> Dict[str, Any]:
+    """
+    Прогресс рассылки: счётчики разворачивания и доставки по каналам, скорость и ETA.
+    Учитываются и строки, уже перенесённые в архив outbox.
+    """
+    error_sample_size = getattr(settings, 'NOTIFY_ERROR_SAMPLE_SIZE', 20)
+    items = broadcast.outbox_items.all()
+    stats = _delivery_stats(items)
+    archived = NotificationOutboxArchive.objects.filter(broadcast_id=broadcast.id)
+    if archived.exists():
+        archived_stats = _delivery_stats(archived)
+        for key in ('sent', 'failed', 'email_sent', 'email_failed'):
+            stats[key] += archived_stats[key]
+        first = [ts for ts in (stats['first_sent_at'], archived_stats['first_sent_at']) if ts]
+        last = [ts for ts in (stats['last_sent_at'], archived_stats['last_sent_at']) if ts]
+        stats['first_sent_at'] = min(first) if first else None
+        stats['last_sent_at'] = max(last) if last else None
+    sent = stats['sent']
+    failed = stats['failed']
+
+    rate = None
+    if sent > 1 and stats['last_sent_at'] > stats['first_sent_at']:
+        rate = sent / (stats['last_sent_at'] - stats['first_sent_at']).total_seconds()
+
+    # Ещё не развёрнутые получатели тоже ждут отправки в Telegram
+    channels = broadcast.channels or []
+    remaining = broadcast.tg_enqueued - sent - failed
+    if (not channels or 'tg' in channels) and broadcast.total_recipients is not None:
+        remaining += broadcast.total_recipients - broadcast.processed_recipients
+
+    errors = [
+        {'id': user_id, 'channel': channel, 'error': error}
+        for user_id, channel, error in items.filter(status=NotificationOutbox.STATUS_FAILED).values_list(
+            'user_id', 'channel', 'last_error',
+        )[:error_sample_size]
+    ]
+
+    return {
+        'id': broadcast.id,
+        'status': broadcast.status,
+        'total_recipients': broadcast.total_recipients,
+        'processed_recipients': broadcast.processed_recipients,
+        'enqueued': broadcast.tg_enqueued,
+        'sent': sent,
+        'failed': failed,
+        'email_enqueued': broadcast.email_enqueued,
+        'email_sent': stats['email_sent'],
+        'email_failed': stats['email_failed'],
+        'rate': round(rate, 2) if rate else None,
+        'eta_seconds': round(remaining / rate) if rate and remaining > 0 else None,
+        'errors': errors,
+        'created_at': broadcast.created_at,
+        'finished_at': broadcast.finished_at,
+    }
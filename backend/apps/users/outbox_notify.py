@@ -0,0 +1,60 @@
+"""
+Пробуждение отправителя outbox сразу после вставки строк (вместо частого опроса БД).
+
+В Postgres строки outbox сами шлют NOTIFY через триггер (см. миграцию 0008),
+бот слушает канал OUTBOX_CHANNEL. Для SQLite/тестов, когда API и бот живут
+в одном процессе, используется in-memory нотификатор.
+"""
+import logging
+from typing import Callable, List
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_CHANNEL = 'notification_outbox'
+
+BACKEND_POSTGRES = 'postgres'
+BACKEND_MEMORY = 'memory'
+
+
+class InMemoryOutboxNotifier:
+    """Процессный pub/sub: notify() вызывает всех подписчиков."""
+
+    def __init__(self) -> None:
+        self._subscribers: List[Callable[[], None]] = []
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[], None]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def notify(self) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback()
+            except Exception:
+                logger.exception("Outbox notifier subscriber failed")
+
+
+memory_notifier = InMemoryOutboxNotifier()
+
+
+def outbox_notify_backend() -> str:
+    """Бэкенд пробуждения: OUTBOX_NOTIFY_BACKEND или по типу БД."""
+    backend = getattr(settings, 'OUTBOX_NOTIFY_BACKEND', '')
+    if backend:
+        return backend
+    return BACKEND_POSTGRES if connection.vendor == 'postgresql' else BACKEND_MEMORY
+
+
+def notify_outbox() -> None:
+    """
+    Сообщить, что в outbox появились строки.
+    В Postgres NOTIFY уже отправил триггер, здесь будим только in-memory подписчиков.
+    """
+    if outbox_notify_backend() == BACKEND_MEMORY:
+        memory_notifier.notify()
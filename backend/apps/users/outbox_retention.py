@@ -0,0 +1,74 @@
+"""
+Ретеншн outbox: отправленные и окончательно неудачные строки старше N дней переносятся
+в NotificationOutboxArchive ограниченными пачками, чтобы таблица outbox и её индексы
+оставались маленькими. Запускается командой archive_outbox или периодической задачей бота.
+"""
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import NotificationOutbox, NotificationOutboxArchive
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_STATUSES = (NotificationOutbox.STATUS_SENT, NotificationOutbox.STATUS_FAILED)
+
+ARCHIVED_FIELDS = (
+    'id', 'user_id', 'broadcast_id', 'template_id', 'channel', 'chat_id', 'email',
+    'subject', 'message', 'status', 'attempts', 'last_error', 'created_at', 'sent_at',
+)
+
+
+def archive_outbox_batch(days: int, batch_size: int) -> int:
+    """
+    Переносит в архив одну пачку (до `batch_size`) строк старше `days` дней.
+    Копия и удаление в одной транзакции; строки блокируются с SKIP LOCKED,
+    поэтому команда не мешает работающему боту. Возвращает число перенесённых строк.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    with transaction.atomic():
+        rows = list(
+            NotificationOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status__in=ARCHIVED_STATUSES, created_at__lt=cutoff)
+            .order_by('id')
+            .values(*ARCHIVED_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        # ignore_conflicts: повторный запуск после сбоя между копией и удалением не падает
+        NotificationOutboxArchive.objects.bulk_create(
+            [NotificationOutboxArchive(**row) for row in rows],
+            ignore_conflicts=True,
+        )
+        NotificationOutbox.objects.filter(id__in=[row['id'] for row in rows]).delete()
+    return len(rows)
+
+
+def archive_outbox(
+    days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    Переносит в архив все устаревшие строки пачками (не больше `max_batches` пачек,
+    если задано). Возвращает общее число перенесённых строк.
+    """
+    days = days if days is not None else getattr(settings, 'OUTBOX_RETENTION_DAYS', 30)
+    batch_size = batch_size or getattr(settings, 'OUTBOX_RETENTION_BATCH_SIZE', 1000)
+
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_outbox_batch(days, batch_size)
+        total += moved
+        batches += 1
+        if moved < batch_size:
+            break
+    if total:
+        logger.info("Archived %s outbox rows older than %s days", total, days)
+    return total
@@ -0,0 +1,138 @@
+"""
+Шаблоны рассылок: текст хранится один раз (OutboxTemplate, адресуется хешем содержимого),
+строки outbox ссылаются на него по FK. Плейсхолдеры получателя ({first_name}, {username}, ...)
+подставляются при отправке; {{ и }} дают литеральные фигурные скобки. Разобранные
+и отрендеренные шаблоны кешируются в процессе.
+"""
+import hashlib
+import re
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from .models import OutboxTemplate, User
+
+# {{ / }} — экранированные скобки, {name} — плейсхолдер
+PLACEHOLDER_RE = re.compile(r'\{\{|\}\}|\{(\w+)\}')
+
+# Плейсхолдеры, которые можно использовать в тексте рассылки
+RECIPIENT_PLACEHOLDERS: Dict[str, Callable[[Optional[User]], str]] = {
+    'first_name': lambda user: (user.first_name or '') if user else '',
+    'last_name': lambda user: (user.last_name or '') if user else '',
+    'username': lambda user: (user.username or '') if user else '',
+    'full_name': lambda user: ' '.join(filter(None, [user.first_name, user.last_name])) if user else '',
+}
+
+# Поля User, которые нужны для подстановки плейсхолдеров
+RECIPIENT_FIELDS = ('id', 'first_name', 'last_name', 'username')
+
+# Шаблоны неизменяемы (адресуются хешем), поэтому их можно держать в процессе без инвалидации
+TEMPLATE_CACHE_SIZE = 256
+# Читается из нескольких потоков DB_EXECUTOR бота: доступ только под _templates_lock
+_templates: Dict[int, OutboxTemplate] = {}
+_templates_lock = threading.Lock()
+
+
+def template_hash(subject: str, body: str) -> str:
+    """SHA-256 от темы и текста шаблона."""
+    return hashlib.sha256(f"{subject}\0{body}".encode('utf-8')).hexdigest()
+
+
+def escape_placeholders(text: str) -> str:
+    """Текст, который при отправке выводится как есть: скобки экранируются."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+def get_or_create_template(subject: str, body: str) -> OutboxTemplate:
+    """Возвращает шаблон с таким содержимым, создавая его при первом использовании."""
+    template, _ = OutboxTemplate.objects.get_or_create(
+        content_hash=template_hash(subject, body),
+        defaults={'subject': subject, 'body': body},
+    )
+    return template
+
+
+@lru_cache(maxsize=1024)
+def _compile(text: str) -> Tuple[Tuple[Tuple[str, Optional[str]], ...], FrozenSet[str]]:
+    """
+    Разбирает текст на части (литерал, плейсхолдер или None) и множество используемых
+    плейсхолдеров. Неизвестные {name} остаются в тексте как есть, {{ и }} становятся { и }.
+    """
+    parts = []
+    fields = set()
+    pos = 0
+    for match in PLACEHOLDER_RE.finditer(text):
+        name = match.group(1)
+        if name is None:
+            parts.append((text[pos:match.start()] + match.group()[0], None))
+            pos = match.end()
+            continue
+        if name not in RECIPIENT_PLACEHOLDERS:
+            continue
+        parts.append((text[pos:match.start()], name))
+        fields.add(name)
+        pos = match.end()
+    parts.append((text[pos:], None))
+    return tuple(parts), frozenset(fields)
+
+
+@lru_cache(maxsize=4096)
+def _render(text: str, values: Tuple[Tuple[str, str], ...]) -> str:
+    parts, _ = _compile(text)
+    context = dict(values)
+    return ''.join(literal + (context[name] if name else '') for literal, name in parts)
+
+
+def render_text(text: str, user: Optional[User]) -> str:
+    """Подставляет плейсхолдеры получателя в текст (без плейсхолдеров — текст как есть)."""
+    parts, fields = _compile(text)
+    if len(parts) == 1:
+        return text  # ни плейсхолдеров, ни экранированных скобок
+    values = tuple(sorted((name, RECIPIENT_PLACEHOLDERS[name](user)) for name in fields))
+    return _render(text, values)
+
+
+def _needs_recipient(template: OutboxTemplate) -> bool:
+    return bool(_compile(template.subject)[1] or _compile(template.body)[1])
+
+
+def _get_templates(template_ids: Iterable[int]) -> Dict[int, OutboxTemplate]:
+    """
+    Шаблоны по id: из кеша процесса, недостающие — одним запросом (вне блокировки).
+    Возвращается свой словарь, поэтому очистка кеша другим потоком его не затронет.
+    """
+    wanted = set(template_ids)
+    with _templates_lock:
+        found = {tid: _templates[tid] for tid in wanted if tid in _templates}
+    missing = wanted.difference(found)
+    if missing:
+        fetched = OutboxTemplate.objects.in_bulk(missing)
+        found.update(fetched)
+        with _templates_lock:
+            if len(_templates) + len(fetched) > TEMPLATE_CACHE_SIZE:
+                _templates.clear()
+            _templates.update(fetched)
+    return found
+
+
+def render_outbox_items(items: Iterable) -> None:
+    """
+    Заполняет message/subject у строк outbox с шаблоном (на месте, без записи в БД).
+    Пользователи подгружаются одним запросом и только если шаблон использует плейсхолдеры.
+    """
+    items = [item for item in items if item.template_id]
+    if not items:
+        return
+
+    templates = _get_templates(item.template_id for item in items)
+    user_ids = {
+        item.user_id for item in items
+        if item.user_id and _needs_recipient(templates[item.template_id])
+    }
+    users = User.objects.only(*RECIPIENT_FIELDS).in_bulk(user_ids) if user_ids else {}
+
+    for item in items:
+        template = templates[item.template_id]
+        user = users.get(item.user_id)
+        item.subject = render_text(template.subject, user)
+        item.message = render_text(template.body, user)
@@ -0,0 +1,102 @@
+"""
+Keyset-пагинация по (created_at, id): страница — это WHERE (created_at, id) > курсор
+ORDER BY created_at, id LIMIT n по индексу, без OFFSET и COUNT(*). Время ответа
+не растёт с номером страницы, новые пользователи не сдвигают выданные страницы.
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+KEYSET_ORDERING = ('created_at', 'id')
+
+Position = Tuple[datetime, int]
+
+
+def keyset_after(position: Optional[Position]) -> Q:
+    """Условие «строго после позиции» в порядке (created_at, id)."""
+    if position is None:
+        return Q()
+    created_at, pk = position
+    return Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+
+
+def encode_cursor(position: Position) -> str:
+    created_at, pk = position
+    return base64.urlsafe_b64encode(f'{created_at.isoformat()}|{pk}'.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Position:
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (TypeError, ValueError):
+        raise NotFound('Invalid cursor')
+
+
+class KeysetPagination(BasePagination):
+    """Пагинация вперёд по (created_at, id); ответ: {"next": <url|null>, "results": [...]}."""
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        position = decode_cursor(cursor) if cursor else None
+
+        # Одна лишняя строка показывает, есть ли следующая страница
+        rows = list(queryset.filter(keyset_after(position)).order_by(*KEYSET_ORDERING)[:page_size + 1])
+        page = rows[:page_size]
+        self.next_position = (page[-1].created_at, page[-1].id) if len(rows) > page_size else None
+        return page
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_position is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Курсор следующей страницы (из поля next)',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Размер страницы (до {self.max_page_size})',
+                'schema': {'type': 'integer'},
+            },
+        ]
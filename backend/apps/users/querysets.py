@@ -0,0 +1,71 @@
+"""
+Querysets API с отображаемыми полями, вычисленными в SQL: имя пользователя — Concat
+по присоединённой таблице, название соревнования — F(). Сериализаторы читают эти
+аннотации через AnnotationField и не обращаются к связанным объектам, поэтому
+ответ строится одним запросом при любом числе строк.
+
+Объект без аннотаций (например, только что созданный) сериализатор не примет:
+AnnotationField падает с ошибкой вместо тихого запроса на каждую строку.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Coalesce, Concat
+from rest_framework import serializers
+
+from .models import RegistrationRequest
+
+
+def full_name(user_path: str) -> Concat:
+    """'Имя Фамилия' пользователя по пути FK (например, 'user' или 'voter')."""
+    return Concat(
+        Coalesce(f'{user_path}__first_name', Value('')),
+        Value(' '),
+        Coalesce(f'{user_path}__last_name', Value('')),
+        output_field=CharField(),
+    )
+
+
+def registration_requests(queryset=None):
+    """Заявки с user_display и competition_display для RegistrationRequestSerializer."""
+    if queryset is None:
+        queryset = RegistrationRequest.objects.all()
+    return queryset.annotate(
+        user_display=full_name('user'),
+        competition_display=F('competition__name'),
+    )
+
+
+class AnnotationField(serializers.CharField):
+    """Строковое поле из аннотации queryset'а; без аннотации — ImproperlyConfigured."""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        try:
+            return getattr(instance, self.source)
+        except AttributeError:
+            raise ImproperlyConfigured(
+                f"{type(instance).__name__} has no '{self.source}' annotation; "
+                f"load it through the queryset helpers in apps.users.querysets / apps.competitions.querysets"
+            )
+
+
+class AnnotatedQuerysetMixin:
+    """
+    Для ModelViewSet: create/update отвечают объектом, перечитанным через display_queryset,
+    то есть с теми же аннотациями, что и list/retrieve.
+    """
+    display_queryset = None  # staticmethod(queryset -> queryset с аннотациями)
+
+    def _reload(self, instance):
+        return self.display_queryset(type(instance).objects.filter(pk=instance.pk)).get()
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        serializer.instance = self._reload(serializer.instance)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        serializer.instance = self._reload(serializer.instance)
@@ -0,0 +1,176 @@
+"""
+Рассмотрение заявок на регистрацию пачкой: API (одна заявка и /bulk/) и админка
+используют одну функцию, поэтому статус заявки и участие в соревновании (M2M по роли)
+всегда меняются вместе.
+
+Всё делается set-wise в одной транзакции, число запросов не зависит от числа заявок:
+UPDATE статусов, INSERT ... ON CONFLICT DO NOTHING / DELETE в through-таблицах ролей
+и bulk_create уведомлений в outbox (отправляет процесс бота). Вставки в through-таблицы
+идут мимо m2m_changed, поэтому updated_at затронутых соревнований (ETag API) обновляется явно.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.competitions.models import Competition
+
+from .models import ROLE_CHOICES, NotificationOutbox, RegistrationRequest, User
+from .outbox_notify import notify_outbox
+from .outbox_templates import escape_placeholders, get_or_create_template
+
+ACTION_APPROVE = 'approve'
+ACTION_REJECT = 'reject'
+
+# Из каких статусов допускается действие (отклонить можно и ранее одобренную заявку)
+ALLOWED_STATUSES = {
+    ACTION_APPROVE: (RegistrationRequest.STATUS_PENDING,),
+    ACTION_REJECT: (RegistrationRequest.STATUS_PENDING, RegistrationRequest.STATUS_APPROVED),
+}
+
+NEW_STATUS = {
+    ACTION_APPROVE: RegistrationRequest.STATUS_APPROVED,
+    ACTION_REJECT: RegistrationRequest.STATUS_REJECTED,
+}
+
+DEFAULT_REJECTION_REASON = 'Причина не указана'
+
+NOTIFICATION_SUBJECT = 'Заявка на регистрацию'
+
+ROLE_NAMES = dict(ROLE_CHOICES)
+
+BATCH_SIZE = 1000
+
+# (id заявки, user_id, competition_id, role, прежний статус)
+RequestRow = Tuple[int, int, int, str, str]
+
+
+def _through(role: str):
+    return Competition._meta.get_field(Competition.ROLE_FIELDS[role]).remote_field.through
+
+
+def _add_members(rows: Iterable[RequestRow]) -> None:
+    """Участие по ролям: один INSERT ... ON CONFLICT DO NOTHING на through-таблицу."""
+    links = defaultdict(list)
+    for _, user_id, competition_id, role, _ in rows:
+        if role in Competition.ROLE_FIELDS:
+            through = _through(role)
+            links[through].append(through(competition_id=competition_id, user_id=user_id))
+    for through, objs in links.items():
+        through.objects.bulk_create(objs, ignore_conflicts=True, batch_size=BATCH_SIZE)
+    Competition.touch({obj.competition_id for objs in links.values() for obj in objs})
+
+
+def _remove_members(rows: Iterable[RequestRow]) -> None:
+    """Снятие с ролей: DELETE на пару (роль, соревнование)."""
+    users = defaultdict(list)
+    for _, user_id, competition_id, role, _ in rows:
+        if role in Competition.ROLE_FIELDS:
+            users[(role, competition_id)].append(user_id)
+    for (role, competition_id), user_ids in users.items():
+        _through(role).objects.filter(competition_id=competition_id, user_id__in=user_ids).delete()
+    Competition.touch({competition_id for _, competition_id in users})
+
+
+def _notification_text(action: str, competition_name: str, role: str, reason: str) -> str:
+    """Текст шаблона: {first_name} подставляется при отправке, остальные значения — как есть."""
+    competition_name = escape_placeholders(competition_name)
+    reason = escape_placeholders(reason)
+    role_name = escape_placeholders(ROLE_NAMES.get(role, role))
+    if action == ACTION_APPROVE:
+        return (
+            f"✅ {{first_name}}, ваша заявка на соревнование «{competition_name}» "
+            f"(роль: {role_name}) одобрена."
+        )
+    return (
+        f"❌ {{first_name}}, ваша заявка на соревнование «{competition_name}» "
+        f"(роль: {role_name}) отклонена.\nПричина: {reason}"
+    )
+
+
+def _enqueue_notifications(rows: List[RequestRow], action: str, reason: str) -> int:
+    """
+    Telegram-уведомления заявителям одним bulk_create. Текст общий для пары
+    (соревнование, роль) и хранится один раз в OutboxTemplate; имя подставляется при отправке.
+    """
+    competition_names = dict(
+        Competition.objects.filter(id__in={row[2] for row in rows}).values_list('id', 'name')
+    )
+    chat_ids = dict(User.objects.filter(id__in={row[1] for row in rows}).values_list('id', 'chat_id'))
+
+    templates: Dict[Tuple[int, str], int] = {}
+    outbox = []
+    for _, user_id, competition_id, role, _ in rows:
+        chat_id = chat_ids.get(user_id)
+        if not chat_id:
+            continue
+        key = (competition_id, role)
+        if key not in templates:
+            text = _notification_text(action, competition_names.get(competition_id, ''), role, reason)
+            templates[key] = get_or_create_template(NOTIFICATION_SUBJECT, text).id
+        outbox.append(NotificationOutbox(
+            user_id=user_id,
+            channel=NotificationOutbox.CHANNEL_TG,
+            chat_id=chat_id,
+            template_id=templates[key],
+        ))
+    NotificationOutbox.objects.bulk_create(outbox, batch_size=BATCH_SIZE)
+    return len(outbox)
+
+
+def review_registration_requests(
+    ids: Iterable[int],
+    action: str,
+    reviewed_by: Optional[User] = None,
+    reason: Optional[str] = None,
+    notify: bool = False,
+) -> Dict[str, object]:
+    """
+    Одобряет или отклоняет заявки с указанными id одной транзакцией.
+
+    Заявки в недопустимом для действия статусе (и несуществующие id) пропускаются.
+    Одобрение добавляет пользователя в соревнование по роли заявки, отклонение ранее
+    одобренной — убирает. С notify=True заявителям ставятся Telegram-уведомления.
+    Возвращает {'updated': [...id], 'skipped': [...id], 'notified': N}.
+    """
+    if action not in NEW_STATUS:
+        raise ValueError(f"Unknown action: {action}")
+    ids = set(ids)
+    reason = reason or DEFAULT_REJECTION_REASON
+    notified = 0
+
+    with transaction.atomic():
+        rows: List[RequestRow] = list(
+            RegistrationRequest.objects
+            .select_for_update()
+            .filter(id__in=ids, status__in=ALLOWED_STATUSES[action])
+            .order_by('id')
+            .values_list('id', 'user_id', 'competition_id', 'role', 'status')
+        )
+        if rows:
+            changes = {
+                'status': NEW_STATUS[action],
+                'reviewed_at': timezone.now(),
+                'reviewed_by': reviewed_by,
+            }
+            if action == ACTION_REJECT:
+                changes['rejection_reason'] = reason
+            RegistrationRequest.objects.filter(id__in=[row[0] for row in rows]).update(**changes)
+
+            if action == ACTION_APPROVE:
+                _add_members(rows)
+            else:
+                _remove_members(row for row in rows if row[4] == RegistrationRequest.STATUS_APPROVED)
+
+            if notify:
+                notified = _enqueue_notifications(rows, action, reason)
+                if notified:
+                    transaction.on_commit(notify_outbox)
+
+    updated = [row[0] for row in rows]
+    return {
+        'updated': updated,
+        'skipped': sorted(ids.difference(updated)),
+        'notified': notified,
+    }
@@ -0,0 +1,65 @@
+"""
+Рендереры выгрузки пользователей: ?format=ndjson и ?format=csv.
+
+Обычный ответ DRF рендерится из готового списка; для выгрузки те же рендереры
+пишут строки по одной (stream), чтобы StreamingHttpResponse отдавал таблицу
+любого размера при постоянном расходе памяти.
+"""
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+class _Line:
+    """Файловый объект для csv.writer: возвращает записанную строку вместо буферизации."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _rows(data: Any) -> List[Dict[str, Any]]:
+    """Данные обычного ответа DRF как список строк (страница, список или один объект)."""
+    if isinstance(data, dict) and 'results' in data:
+        data = data['results']
+    if isinstance(data, dict):
+        data = [data]
+    return list(data or [])
+
+
+class NDJSONRenderer(BaseRenderer):
+    """JSON Lines: по объекту в строке."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def stream(self, fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+        for row in rows:
+            yield json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return ''.join(
+            json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for row in _rows(data)
+        ).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV с заголовком из имён полей; None пишется пустой ячейкой."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def stream(self, fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+        writer = csv.writer(_Line())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow(row)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = _rows(data)
+        if not rows:
+            return b''
+        fields = list(rows[0])
+        return ''.join(self.stream(fields, ([row.get(field) for field in fields] for row in rows))).encode(self.charset)
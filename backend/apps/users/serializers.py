@@ -1,16 +1,27 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import User, RegistrationRequest
+from .querysets import AnnotationField
+from .registration import ACTION_APPROVE, ACTION_REJECT
 
 class UserSerializer(serializers.ModelSerializer):
+    """Пользователь; fields=[...] оставляет только указанные поля (параметр ?fields=)"""
     class Meta:
         model = User
         fields = '__all__'
 
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
 
 class RegistrationRequestSerializer(serializers.ModelSerializer):
     """Сериализатор для заявок на регистрацию"""
-    user_display = serializers.SerializerMethodField()
-    competition_display = serializers.SerializerMethodField()
+    # Аннотации из apps.users.querysets.registration_requests
+    user_display = AnnotationField()
+    competition_display = AnnotationField()
     
     class Meta:
         model = RegistrationRequest
@@ -20,9 +31,15 @@ class RegistrationRequestSerializer(serializers.ModelSerializer):
             'user_phone', 'created_at', 'reviewed_at', 'reviewed_by', 'rejection_reason'
         ]
         read_only_fields = ['id', 'created_at', 'reviewed_at', 'reviewed_by']
-    
-    def get_user_display(self, obj):
-        return f"{obj.user.first_name} {obj.user.last_name}"
-    
-    def get_competition_display(self, obj):
-        return obj.competition.name
+
+
+class RegistrationRequestBulkSerializer(serializers.Serializer):
+    """Тело POST /api/registration-requests/bulk/"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.REGISTRATION_BULK_MAX_IDS,
+    )
+    action = serializers.ChoiceField(choices=[ACTION_APPROVE, ACTION_REJECT])
+    reason = serializers.CharField(required=False, allow_blank=True)
+    notify = serializers.BooleanField(required=False, default=True)
@@ -0,0 +1,14 @@
+"""
+Инвалидация закешированных в диалогах бота пользователей при изменении (админка, API).
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_version, user_version_key
+from .models import User
+
+
+@receiver(post_save, sender=User, dispatch_uid='user_cache_post_save')
+@receiver(post_delete, sender=User, dispatch_uid='user_cache_post_delete')
+def invalidate_user_cache(sender, instance, **kwargs):
+    bump_version(user_version_key(instance.id))
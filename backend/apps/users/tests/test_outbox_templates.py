@@ -0,0 +1,28 @@
+import pytest
+
+from apps.users import outbox_templates
+from apps.users.models import User
+from apps.users.outbox_templates import escape_placeholders, get_or_create_template, render_text
+
+
+@pytest.mark.django_db
+def test_get_templates_returns_own_dict_when_cache_is_reset(monkeypatch):
+    monkeypatch.setattr(outbox_templates, 'TEMPLATE_CACHE_SIZE', 2)
+    monkeypatch.setattr(outbox_templates, '_templates', {})
+    first, second, third = (get_or_create_template('', f'text {i}') for i in range(3))
+
+    cached = outbox_templates._get_templates([first.id, second.id])
+    # Overflows the cache: the process cache is cleared, the returned dicts stay complete
+    fetched = outbox_templates._get_templates([third.id, first.id])
+
+    assert set(cached) == {first.id, second.id}
+    assert set(fetched) == {first.id, third.id}
+    assert fetched[first.id].body == 'text 0'
+
+
+def test_escaped_braces_are_not_placeholders():
+    user = User(first_name='Иван', username='ivan')
+
+    assert render_text('{{username}} {first_name}', user) == '{username} Иван'
+    assert render_text('{{}} без плейсхолдеров', user) == '{} без плейсхолдеров'
+    assert render_text(escape_placeholders('{first_name} }{'), user) == '{first_name} }{'
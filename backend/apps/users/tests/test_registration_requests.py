@@ -0,0 +1,117 @@
+import pytest
+
+from apps.competitions.models import Competition
+from apps.users.models import RegistrationRequest, User
+
+
+def _requests(count, competition):
+    users = User.objects.bulk_create([
+        User(chat_id=f'rr{i}', first_name=f'Имя{i}', last_name=f'Фамилия{i}') for i in range(count)
+    ])
+    return RegistrationRequest.objects.bulk_create([
+        RegistrationRequest(
+            user=user, competition=competition, role='voter',
+            user_first_name=user.first_name, user_last_name=user.last_name,
+            user_email='a@example.com', user_phone='1',
+        )
+        for user in users
+    ])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('count', [3, 30])
+def test_registration_request_list_query_count(admin_client, django_assert_num_queries, count):
+    _requests(count, Competition.objects.create(name='Кубок'))
+
+    # Один запрос с аннотациями, без запросов на строку
+    with django_assert_num_queries(1):
+        response = admin_client.get('/api/registration-requests/')
+
+    assert response.status_code == 200
+    assert len(response.json()) == count
+
+
+@pytest.mark.django_db
+def test_registration_request_display_fields_match_related_objects(admin_client):
+    competition = Competition.objects.create(name='Кубок')
+    _requests(3, competition)
+
+    rows = admin_client.get('/api/registration-requests/').json()
+
+    for row in rows:
+        reg_request = RegistrationRequest.objects.get(id=row['id'])
+        # Значения прежних SerializerMethodField
+        assert row['user_display'] == f"{reg_request.user.first_name} {reg_request.user.last_name}"
+        assert row['competition_display'] == reg_request.competition.name
+
+
+@pytest.mark.django_db
+def test_registration_request_retrieve_query_count(admin_client, django_assert_num_queries):
+    reg_request, = _requests(1, Competition.objects.create(name='Кубок'))
+
+    with django_assert_num_queries(1):
+        response = admin_client.get(f'/api/registration-requests/{reg_request.id}/')
+
+    assert response.status_code == 200
+    assert response.json()['competition_display'] == 'Кубок'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('action, num_queries', [
+    # Заявка, транзакция (SAVEPOINT, SELECT FOR UPDATE, UPDATE, участие и touch соревнования) и ответ
+    ('approve', 8),
+    # У ожидающей заявки участия ещё нет: без INSERT и touch
+    ('reject', 6),
+])
+def test_registration_request_review_query_count(admin_client, django_assert_num_queries, action, num_queries):
+    reg_request, = _requests(1, Competition.objects.create(name='Кубок'))
+
+    with django_assert_num_queries(num_queries):
+        response = admin_client.post(f'/api/registration-requests/{reg_request.id}/{action}/', format='json')
+
+    assert response.status_code == 200
+    assert response.json()['user_display'] == 'Имя0 Фамилия0'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('count', [3, 30])
+def test_registration_request_bulk_query_count(admin_client, django_assert_num_queries, count):
+    requests = _requests(count, Competition.objects.create(name='Кубок'))
+
+    # Транзакция: SELECT FOR UPDATE, UPDATE, участие и touch соревнования; уведомления —
+    # названия соревнований, chat_id, шаблон (get_or_create) и один bulk_create outbox
+    with django_assert_num_queries(13):
+        response = admin_client.post(
+            '/api/registration-requests/bulk/',
+            {'ids': [reg_request.id for reg_request in requests], 'action': 'approve'},
+            format='json',
+        )
+
+    assert response.status_code == 200
+    assert response.json()['updated'] == count
+    assert response.json()['notified'] == count
+
+
+@pytest.mark.django_db
+def test_registration_request_create_and_update_query_count(admin_client, django_assert_num_queries):
+    competition = Competition.objects.create(name='Кубок')
+    user = User.objects.create(chat_id='new', first_name='Иван', last_name='Петров')
+    payload = {
+        'user': user.id, 'competition': competition.id, 'role': 'voter',
+        'user_first_name': 'Иван', 'user_last_name': 'Петров',
+        'user_email': 'a@example.com', 'user_phone': '1',
+    }
+
+    # Проверка user/competition, уникальности, INSERT и перечитывание с аннотациями (_reload)
+    with django_assert_num_queries(5):
+        response = admin_client.post('/api/registration-requests/', payload, format='json')
+    assert response.status_code == 201
+    assert response.json()['user_display'] == 'Иван Петров'
+
+    # Объект, проверка user/competition, уникальности, UPDATE и _reload
+    with django_assert_num_queries(6):
+        response = admin_client.patch(
+            f"/api/registration-requests/{response.json()['id']}/", {'rejection_reason': '-'}, format='json',
+        )
+    assert response.status_code == 200
+    assert response.json()['competition_display'] == 'Кубок'
@@ -0,0 +1,49 @@
+import pytest
+
+from apps.competitions.models import Competition
+from apps.users.models import NotificationOutbox, RegistrationRequest, User
+from apps.users.outbox_templates import render_outbox_items
+
+
+@pytest.fixture
+def reg_request():
+    user = User.objects.create(chat_id='100', first_name='Иван', username='ivan')
+    competition = Competition.objects.create(name='Кубок {first_name}')
+    return RegistrationRequest.objects.create(
+        user=user, competition=competition, role='voter',
+        user_first_name='Иван', user_last_name='', user_email='a@example.com', user_phone='1',
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_reject_keeps_reason_and_competition_name_literal(admin_client, reg_request):
+    response = admin_client.post(
+        '/api/registration-requests/bulk/',
+        {'ids': [reg_request.id], 'action': 'reject', 'reason': 'Ник {username} занят'},
+        format='json',
+    )
+
+    assert response.status_code == 200
+    assert response.json()['notified'] == 1
+    items = list(NotificationOutbox.objects.all())
+    render_outbox_items(items)
+    message = items[0].message
+    # Имя получателя подставлено, а значения из заявки выведены как есть
+    assert message.startswith('❌ Иван, ')
+    assert '«Кубок {first_name}»' in message
+    assert 'Ник {username} занят' in message
+
+
+@pytest.mark.django_db
+def test_single_approve_notifies_only_on_request(admin_client, reg_request):
+    url = f'/api/registration-requests/{reg_request.id}/approve/'
+
+    assert admin_client.post(url, format='json').status_code == 200
+    assert not NotificationOutbox.objects.exists()
+    assert reg_request.competition.voters.filter(id=reg_request.user_id).exists()
+
+    reg_request.refresh_from_db()
+    reg_request.status = RegistrationRequest.STATUS_PENDING
+    reg_request.save()
+    assert admin_client.post(url, {'notify': True}, format='json').status_code == 200
+    assert NotificationOutbox.objects.filter(chat_id='100').count() == 1
@@ -0,0 +1,10 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+
+@pytest.mark.parametrize('webhook_url', ['', 'http://0.0.0.0:8443/telegram'])
+def test_webhook_mode_requires_public_https_url(monkeypatch, webhook_url):
+    monkeypatch.setenv('TELEGRAM_TOKEN', '123:test')
+
+    with pytest.raises(CommandError, match='https'):
+        call_command('runbot', mode='webhook', webhook_url=webhook_url)
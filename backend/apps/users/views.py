@@ -1,12 +1,35 @@
-from rest_framework import viewsets, status
+from rest_framework import serializers, status, viewsets
 from rest_framework.decorators import api_view, action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from django.core.mail import send_mass_mail
 from django.conf import settings
-from django.utils import timezone
-from .models import User, NotificationOutbox, RegistrationRequest
-from .serializers import UserSerializer, RegistrationRequestSerializer
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from .db_stats import connection_stats
+from .models import User, RegistrationRequest, Broadcast
+from .notifications import broadcast_progress, create_broadcast
+from .pagination import KEYSET_ORDERING, KeysetPagination, keyset_after
+from .querysets import AnnotatedQuerysetMixin, registration_requests
+from .registration import (
+    ACTION_APPROVE,
+    ACTION_REJECT,
+    DEFAULT_REJECTION_REASON,
+    review_registration_requests,
+)
+from .renderers import CSVRenderer, NDJSONRenderer
+from .serializers import (
+    RegistrationRequestBulkSerializer,
+    RegistrationRequestSerializer,
+    UserSerializer,
+)
+
+# Поля пользователя, доступные в API и выгрузке (как у UserSerializer с '__all__')
+USER_FIELDS = tuple(field.name for field in User._meta.concrete_fields)
+
 
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -14,21 +37,84 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     
     Требует заголовок X-Admin-Token для доступа.
     
-    list: Получить список всех пользователей
+    list: Получить список пользователей (keyset-пагинация по created_at, id)
     retrieve: Получить детали конкретного пользователя
+
+    ?fields=id,first_name,email — только указанные поля (из БД читаются только они).
+    ?format=ndjson|csv — потоковая выгрузка всех пользователей без пагинации.
     """
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    pagination_class = KeysetPagination
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer, CSVRenderer]
+    # Строк на один запрос к БД при выгрузке
+    export_chunk_size = 2000
 
     def get_queryset(self):
         # Check admin token
         token = self.request.headers.get('X-Admin-Token', '')
         if token != settings.ADMIN_TOKEN:
             return User.objects.none()
-        return User.objects.all()
+        # created_at нужен для курсора, даже если не запрошен
+        return User.objects.only(*{*self.get_fields(), 'created_at'})
+
+    def get_fields(self):
+        """Поля из ?fields= (по умолчанию все); неизвестное поле — 400."""
+        request = getattr(self, 'request', None)
+        raw = request.query_params.get('fields', '') if request is not None else ''
+        if not raw:
+            return USER_FIELDS
+        fields = tuple(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+        unknown = [name for name in fields if name not in USER_FIELDS]
+        if unknown or not fields:
+            raise ValidationError({'fields': f"Unknown fields: {', '.join(unknown)}" if unknown else 'Empty list'})
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if isinstance(renderer, (NDJSONRenderer, CSVRenderer)):
+            token = request.headers.get('X-Admin-Token', '')
+            if token != settings.ADMIN_TOKEN:
+                return Response({'error': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+            return self.export(renderer)
+        return super().list(request, *args, **kwargs)
+
+    def export(self, renderer):
+        """
+        Потоковая выгрузка: строки читаются пачками по export_chunk_size тем же
+        keyset-условием, что и у пагинации, поэтому память не зависит от числа
+        пользователей (в том числе за pgbouncer, где серверные курсоры отключены).
+        """
+        fields = self.get_fields()
+        size = self.export_chunk_size
 
+        def rows():
+            position = None
+            while True:
+                chunk = list(
+                    User.objects.filter(keyset_after(position))
+                    .order_by(*KEYSET_ORDERING)
+                    .values_list(*fields, *KEYSET_ORDERING)[:size]
+                )
+                for row in chunk:
+                    yield row[:len(fields)]
+                if len(chunk) < size:
+                    return
+                position = chunk[-1][len(fields):]
 
-class RegistrationRequestViewSet(viewsets.ModelViewSet):
+        response = StreamingHttpResponse(
+            renderer.stream(fields, rows()),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        response['Content-Disposition'] = f'attachment; filename="users.{renderer.format}"'
+        return response
+
+
+class RegistrationRequestViewSet(AnnotatedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoints для управления заявками на регистрацию.
     
@@ -41,9 +127,11 @@ class RegistrationRequestViewSet(viewsets.ModelViewSet):
     partial_update: Частичное обновление заявки
     approve: Одобрить заявку (action)
     reject: Отклонить заявку (action)
+    bulk: Одобрить или отклонить пачку заявок одним запросом (action)
     """
     queryset = RegistrationRequest.objects.all()
     serializer_class = RegistrationRequestSerializer
+    display_queryset = staticmethod(registration_requests)
     filterset_fields = ['status', 'competition', 'role']
     ordering_fields = ['created_at', 'status']
     ordering = ['-created_at']
@@ -53,7 +141,28 @@ class RegistrationRequestViewSet(viewsets.ModelViewSet):
         token = self.request.headers.get('X-Admin-Token', '')
         if token != settings.ADMIN_TOKEN:
             return RegistrationRequest.objects.none()
-        return RegistrationRequest.objects.select_related('user', 'competition', 'reviewed_by')
+        # Имена пользователя и соревнования — аннотации в том же запросе, без загрузки связанных строк
+        return registration_requests()
+
+    def get_serializer_class(self):
+        if self.action == 'bulk':
+            return RegistrationRequestBulkSerializer
+        return RegistrationRequestSerializer
+
+    def _review(self, request, ids, action, reason=None, notify=False):
+        return review_registration_requests(
+            ids,
+            action,
+            # reviewed_by ссылается на пользователя бота, а не на пользователя Django auth
+            reviewed_by=request.user if isinstance(request.user, User) else None,
+            reason=reason,
+            notify=notify,
+        )
+
+    @staticmethod
+    def _notify_requested(request):
+        """approve/reject одной заявки уведомляют заявителя только по {"notify": true}."""
+        return request.data.get('notify') in serializers.BooleanField.TRUE_VALUES
     
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
@@ -74,25 +183,11 @@ class RegistrationRequestViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        reg_request.status = RegistrationRequest.STATUS_APPROVED
-        reg_request.reviewed_at = timezone.now()
-        reg_request.reviewed_by = request.user if request.user.is_authenticated else None
-        reg_request.save()
-        
-        # Добавляем пользователя в соревнование по его роли (идемпотентно)
-        competition = reg_request.competition
-        user = reg_request.user
-        if reg_request.role == 'player':
-            competition.arbitrators.add(user)
-        elif reg_request.role == 'voter':
-            competition.voters.add(user)
-        elif reg_request.role == 'viewer':
-            competition.viewers.add(user)
-        elif reg_request.role == 'adviser':
-            competition.advisers.add(user)
+        # Статус, участие в соревновании по роли и уведомление — одной транзакцией
+        self._review(request, [reg_request.id], ACTION_APPROVE, notify=self._notify_requested(request))
         
         return Response(
-            RegistrationRequestSerializer(reg_request).data,
+            RegistrationRequestSerializer(self.get_object()).data,
             status=status.HTTP_200_OK
         )
     
@@ -120,33 +215,43 @@ class RegistrationRequestViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        reason = request.data.get('reason', 'Причина не указана')
-        competition = reg_request.competition
-        user = reg_request.user
-        previous_status = reg_request.status
-        
-        reg_request.status = RegistrationRequest.STATUS_REJECTED
-        reg_request.reviewed_at = timezone.now()
-        reg_request.reviewed_by = request.user if request.user.is_authenticated else None
-        reg_request.rejection_reason = reason
-        reg_request.save()
-
-        # Если заявка была ранее одобрена — убираем пользователя из соревнования
-        if previous_status == RegistrationRequest.STATUS_APPROVED and user is not None:
-            if reg_request.role == 'player':
-                competition.arbitrators.remove(user)
-            elif reg_request.role == 'voter':
-                competition.voters.remove(user)
-            elif reg_request.role == 'viewer':
-                competition.viewers.remove(user)
-            elif reg_request.role == 'adviser':
-                competition.advisers.remove(user)
+        # Если заявка была ранее одобрена — пользователь убирается из соревнования
+        reason = request.data.get('reason', DEFAULT_REJECTION_REASON)
+        self._review(
+            request, [reg_request.id], ACTION_REJECT, reason=reason, notify=self._notify_requested(request),
+        )
         
         return Response(
-            RegistrationRequestSerializer(reg_request).data,
+            RegistrationRequestSerializer(self.get_object()).data,
             status=status.HTTP_200_OK
         )
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Одобрить или отклонить пачку заявок: {"ids": [...], "action": "approve" | "reject",
+        "reason": "...", "notify": true}. Заявки в неподходящем статусе пропускаются.
+        """
+        token = request.headers.get('X-Admin-Token', '')
+        if token != settings.ADMIN_TOKEN:
+            return Response({'error': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        result = self._review(
+            request, data['ids'], data['action'], reason=data.get('reason'), notify=data['notify'],
+        )
+        return Response(
+            {
+                'action': data['action'],
+                'updated': len(result['updated']),
+                'skipped': result['skipped'],
+                'notified': result['notified'],
+            },
+            status=status.HTTP_200_OK,
+        )
+
 
 class NotifyAPIView(APIView):
     """
@@ -155,11 +260,15 @@ class NotifyAPIView(APIView):
     POST /api/notify/
     
     Параметры:
-    - message (обязательно): текст сообщения
+    - message (обязательно): текст сообщения, допускает плейсхолдеры {first_name}, {last_name},
+      {username}, {full_name}
     - subject (опционально): тема письма (для email)
     - role (опционально): фильтр по роли (player, voter, viewer, adviser, admin)
     - channels (опционально): список каналов ['tg', 'email']
     
+    Рассылка выполняется в фоне процессом бота: ответ 202 с id задачи,
+    прогресс — GET /api/notify/<id>/.
+    
     Требует заголовок X-Admin-Token.
     """
     def post(self, request):
@@ -175,58 +284,52 @@ class NotifyAPIView(APIView):
         if not message:
             return Response({'error': 'message required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Filter users by role if specified
-        if role:
-            users = User.objects.filter(role=role)
-        else:
-            users = User.objects.all()
-
-        results = []
-        tg_enqueued = 0
-
-        for user in users:
-            result = {
-                'id': user.id,
-                'chat_id': user.chat_id,
-                'email': user.email,
-                'ok': True,
-                'details': []
-            }
-
-            # Telegram: складываем в outbox (будет отправлено процессом bot)
-            if not channels or 'tg' in channels:
-                try:
-                    NotificationOutbox.objects.create(
-                        user=user,
-                        chat_id=user.chat_id,
-                        message=message,
-                    )
-                    tg_enqueued += 1
-                    result['details'].append({'channel': 'tg', 'ok': True, 'queued': True})
-                except Exception as e:
-                    result['ok'] = False
-                    result['details'].append({'channel': 'tg', 'ok': False, 'error': str(e)})
-
-            # Send via Email
-            if (not channels or 'email' in channels) and user.email:
-                try:
-                    from django.core.mail import send_mail
-                    send_mail(
-                        subject,
-                        message,
-                        settings.DEFAULT_FROM_EMAIL,
-                        [user.email],
-                        fail_silently=False,
-                    )
-                    result['details'].append({'channel': 'email', 'ok': True})
-                except Exception as e:
-                    result['ok'] = False
-                    result['details'].append({'channel': 'email', 'ok': False, 'error': str(e)})
-
-            results.append(result)
-
-        return Response({
-            'count': len(results),
-            'tg_enqueued': tg_enqueued,
-            'results': results
-        })
+        broadcast = create_broadcast(message, subject, role, channels)
+        return Response(
+            {
+                'id': broadcast.id,
+                'status': broadcast.status,
+                'url': reverse('notify-status', kwargs={'pk': broadcast.id}),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class BroadcastStatusAPIView(APIView):
+    """
+    Прогресс рассылки.
+    
+    GET /api/notify/<id>/
+    
+    Возвращает: статус, число получателей, поставлено в очередь / отправлено / ошибок,
+    скорость отправки (сообщений/сек) и оценку оставшегося времени (eta_seconds).
+    
+    Требует заголовок X-Admin-Token.
+    """
+    def get(self, request, pk):
+        token = request.headers.get('X-Admin-Token', '')
+        if token != settings.ADMIN_TOKEN:
+            return Response({'error': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        broadcast = get_object_or_404(Broadcast, pk=pk)
+        return Response(broadcast_progress(broadcast))
+
+
+class DatabaseStatsAPIView(APIView):
+    """
+    Статистика соединений с БД процесса API.
+    
+    GET /api/health/db/
+    
+    Возвращает: открыто соединений, запросов (checkouts) и сколько из них переиспользовали
+    открытое соединение, а также настройки CONN_MAX_AGE / health checks / pgbouncer.
+    Счётчики — на процесс (воркер), pid в ответе.
+    
+    Требует заголовок X-Admin-Token.
+    """
+    def get(self, request):
+        token = request.headers.get('X-Admin-Token', '')
+        if token != settings.ADMIN_TOKEN:
+            return Response({'error': 'unauthorized'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        return Response(connection_stats.snapshot())
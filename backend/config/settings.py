@@ -62,9 +62,20 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', 'postgres'),
         'HOST': os.getenv('DB_HOST', 'db'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # Постоянные соединения: потоки бота (BOT_DB_THREADS) и веб-воркеры не переподключаются на каждый запрос
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        # Проверка соединения перед переиспользованием (после рестарта БД/pgbouncer)
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        # За pgbouncer в режиме transaction серверные курсоры (.iterator()) не переживают транзакцию
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_PGBOUNCER', 'False') == 'True',
     }
 }
 
+# LISTEN/NOTIFY не работает через pgbouncer в режиме transaction: слушатель outbox
+# подключается к Postgres напрямую (по умолчанию туда же, куда и ORM)
+OUTBOX_LISTEN_HOST = os.getenv('DB_LISTEN_HOST', DATABASES['default']['HOST'])
+OUTBOX_LISTEN_PORT = os.getenv('DB_LISTEN_PORT', DATABASES['default']['PORT'])
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -89,6 +100,8 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [],
     'DEFAULT_PERMISSION_CLASSES': [],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Глобальной пагинации нет: её задают сами viewset'ы (pagination_class), остальные
+    # списки (/api/registration-requests/, /api/voter-time-slots/) — массивом, как раньше
 }
 
 # Если будете подключать внешний UI, добавьте origin'ы сюда.
@@ -109,6 +122,77 @@ DEFAULT_FROM_EMAIL = os.getenv('FROM_EMAIL', 'noreply@example.com')
 CONTACT_EMAIL_TO = os.getenv('CONTACT_EMAIL_TO', 'support@example.com')
 
 # Настройки outbox-рассылок Telegram
-BOT_OUTBOX_POLL_SECONDS = int(os.getenv('BOT_OUTBOX_POLL_SECONDS', '2'))
+BOT_OUTBOX_POLL_SECONDS = int(os.getenv('BOT_OUTBOX_POLL_SECONDS', '30'))
 BOT_OUTBOX_BATCH_SIZE = int(os.getenv('BOT_OUTBOX_BATCH_SIZE', '50'))
 BOT_OUTBOX_MAX_ATTEMPTS = int(os.getenv('BOT_OUTBOX_MAX_ATTEMPTS', '10'))
+# Параллельная отправка outbox: число запросов в полёте и лимиты Telegram (сообщений/сек)
+BOT_OUTBOX_CONCURRENCY = int(os.getenv('BOT_OUTBOX_CONCURRENCY', '30'))
+BOT_OUTBOX_GLOBAL_RATE = float(os.getenv('BOT_OUTBOX_GLOBAL_RATE', '30'))
+BOT_OUTBOX_PER_CHAT_RATE = float(os.getenv('BOT_OUTBOX_PER_CHAT_RATE', '1'))
+# Повторы outbox: экспоненциальный backoff с jitter (RetryAfter использует задержку сервера)
+BOT_OUTBOX_RETRY_BASE_SECONDS = float(os.getenv('BOT_OUTBOX_RETRY_BASE_SECONDS', '5'))
+BOT_OUTBOX_RETRY_MAX_SECONDS = float(os.getenv('BOT_OUTBOX_RETRY_MAX_SECONDS', '3600'))
+# Несколько процессов бота: строки outbox захватываются с арендой (status=sending).
+# Идентификатор воркера по умолчанию — host:pid.
+BOT_WORKER_ID = os.getenv('BOT_WORKER_ID', '')
+BOT_OUTBOX_LEASE_SECONDS = int(os.getenv('BOT_OUTBOX_LEASE_SECONDS', '300'))
+# Django cache: версии для инвалидации кешей бота. По умолчанию — в памяти процесса;
+# для мгновенной инвалидации между API и ботом задайте общий бэкенд, например
+# CACHE_BACKEND=django.core.cache.backends.db.DatabaseCache CACHE_LOCATION=django_cache
+# (после python manage.py createcachetable)
+# Версии для инвалидации кешей бота (пользователи, соревнования) должны быть видны и API,
+# и боту: в docker-compose — общий Redis. LocMemCache по умолчанию — только процесс (разработка).
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+# Пользователь, закешированный в диалоге бота (сек); сбрасывается при правке в админке
+USER_SESSION_CACHE_TTL = int(os.getenv('USER_SESSION_CACHE_TTL', '300'))
+# /start не пишет в БД, если профиль Telegram этого чата не менялся за это время (сек)
+BOT_PROFILE_CACHE_SECONDS = int(os.getenv('BOT_PROFILE_CACHE_SECONDS', '600'))
+# Кеш соревнований в процессе бота (сек); сбрасывается сигналами при изменении соревнования
+COMPETITION_CACHE_TTL = int(os.getenv('COMPETITION_CACHE_TTL', '60'))
+# Пул потоков бота для ORM-запросов (по соединению с БД на поток)
+BOT_DB_THREADS = int(os.getenv('BOT_DB_THREADS', '10'))
+# Как часто бот пишет в лог статистику соединений (0 — не писать)
+BOT_DB_STATS_LOG_SECONDS = int(os.getenv('BOT_DB_STATS_LOG_SECONDS', '600'))
+# Пробуждение отправителя outbox: 'postgres' (LISTEN/NOTIFY) или 'memory' (один процесс).
+# Пусто — выбирается по типу БД; BOT_OUTBOX_POLL_SECONDS остаётся страховочным опросом.
+OUTBOX_NOTIFY_BACKEND = os.getenv('OUTBOX_NOTIFY_BACKEND', '')
+# Массовая рассылка /api/notify/: размер пачки bulk_create/iterator и число ошибок в ответе
+NOTIFY_CHUNK_SIZE = int(os.getenv('NOTIFY_CHUNK_SIZE', '1000'))
+NOTIFY_ERROR_SAMPLE_SIZE = int(os.getenv('NOTIFY_ERROR_SAMPLE_SIZE', '20'))
+# POST /api/registration-requests/bulk/: максимум заявок в одном запросе
+REGISTRATION_BULK_MAX_IDS = int(os.getenv('REGISTRATION_BULK_MAX_IDS', '5000'))
+# Email-рассылки идут через outbox: лимит провайдера, писем в минуту (0 — без лимита)
+# При лимите бот забирает за раз не больше писем, чем успеет отправить за половину BOT_OUTBOX_LEASE_SECONDS
+EMAIL_OUTBOX_PER_MINUTE = int(os.getenv('EMAIL_OUTBOX_PER_MINUTE', '0'))
+# Ретеншн outbox: sent/failed строки старше N дней переносятся в архив (0 — отключено)
+OUTBOX_RETENTION_DAYS = int(os.getenv('OUTBOX_RETENTION_DAYS', '30'))
+OUTBOX_RETENTION_BATCH_SIZE = int(os.getenv('OUTBOX_RETENTION_BATCH_SIZE', '1000'))
+OUTBOX_RETENTION_INTERVAL_SECONDS = int(os.getenv('OUTBOX_RETENTION_INTERVAL_SECONDS', '3600'))
+# Состояние диалогов бота между перезапусками: 'db' (таблица BotState), 'file' (pickle, для разработки)
+# или пусто — без сохранения. Запись пачками раз в BOT_PERSISTENCE_INTERVAL секунд и при остановке.
+BOT_PERSISTENCE = os.getenv('BOT_PERSISTENCE', 'db')
+BOT_PERSISTENCE_FILE = os.getenv('BOT_PERSISTENCE_FILE', str(BASE_DIR / 'bot_state.pickle'))
+BOT_PERSISTENCE_INTERVAL = float(os.getenv('BOT_PERSISTENCE_INTERVAL', '30'))
+# Получение обновлений (manage.py runbot): 'polling' или 'webhook'
+BOT_MODE = os.getenv('BOT_MODE', 'polling')
+# Сколько обновлений бот обрабатывает одновременно; обновления одного чата — всегда по очереди
+BOT_CONCURRENT_UPDATES = int(os.getenv('BOT_CONCURRENT_UPDATES', '16'))
+# Сколько обновлений может ждать и выполняться одновременно, прежде чем бот перестанет их забирать
+BOT_UPDATE_MAX_PENDING = int(os.getenv('BOT_UPDATE_MAX_PENDING', '1000'))
+# Как часто бот пишет в лог глубину очереди и ожидание обновлений (0 — не писать)
+BOT_UPDATE_STATS_LOG_SECONDS = int(os.getenv('BOT_UPDATE_STATS_LOG_SECONDS', '600'))
+# Webhook: HTTP-сервер бота и публичный https-адрес, который регистрируется в Telegram
+# (BOT_WEBHOOK_URL обязателен при BOT_MODE=webhook).
+# BOT_WEBHOOK_SECRET пуст — секрет выводится из токена (заголовок X-Telegram-Bot-Api-Secret-Token).
+BOT_WEBHOOK_LISTEN = os.getenv('BOT_WEBHOOK_LISTEN', '0.0.0.0')
+BOT_WEBHOOK_PORT = int(os.getenv('BOT_WEBHOOK_PORT', '8443'))
+BOT_WEBHOOK_PATH = os.getenv('BOT_WEBHOOK_PATH', 'telegram')
+BOT_WEBHOOK_URL = os.getenv('BOT_WEBHOOK_URL', '')
+BOT_WEBHOOK_SECRET = os.getenv('BOT_WEBHOOK_SECRET', '')
+# Одновременных соединений Telegram с webhook (1-100)
+BOT_WEBHOOK_MAX_CONNECTIONS = int(os.getenv('BOT_WEBHOOK_MAX_CONNECTIONS', '40'))
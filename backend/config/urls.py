@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
-from apps.users.views import NotifyAPIView
+from apps.users.views import NotifyAPIView, BroadcastStatusAPIView, DatabaseStatsAPIView
 
 # Кастомизация заголовков админки
 admin.site.site_header = "Панель организатора соревнований"
@@ -20,4 +20,6 @@ urlpatterns = [
     path('api/', include('apps.users.urls')),
     path('api/', include('apps.competitions.urls')),
     path('api/notify/', NotifyAPIView.as_view(), name='notify'),
+    path('api/notify/<int:pk>/', BroadcastStatusAPIView.as_view(), name='notify-status'),
+    path('api/health/db/', DatabaseStatsAPIView.as_view(), name='db-stats'),
 ]
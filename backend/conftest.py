@@ -0,0 +1,8 @@
+import pytest
+from django.conf import settings
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def admin_client():
+    return APIClient(HTTP_X_ADMIN_TOKEN=settings.ADMIN_TOKEN)